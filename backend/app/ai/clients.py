@@ -0,0 +1,33 @@
+import threading
+
+from app.config import OPENAI_API_KEY, OPENAI_BASE_URL, OPENAI_TIMEOUT
+
+_clients = {}
+_lock = threading.Lock()
+
+
+def _client(kind: str):
+    client = _clients.get(kind)
+    if client is not None:
+        return client
+
+    with _lock:
+        if kind not in _clients:
+            # Importing openai costs more than the rest of the app's boot, and
+            # constructing a client raises without a key, so both wait until
+            # the first completion. The caller's fallback handles the error.
+            from openai import OpenAI, AsyncOpenAI
+
+            factory = AsyncOpenAI if kind == "async" else OpenAI
+            _clients[kind] = factory(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, timeout=OPENAI_TIMEOUT)
+        return _clients[kind]
+
+
+def get_client():
+    """Shared sync OpenAI client, created on first use."""
+    return _client("sync")
+
+
+def get_async_client():
+    """Shared AsyncOpenAI client, created on first use."""
+    return _client("async")
@@ -1,10 +1,44 @@
-from openai import OpenAI
-from app.config import OPENAI_API_KEY
+import asyncio
+import hashlib
+import json
 import logging
+import threading
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+from app.ai.clients import get_client, get_async_client
+from app.ai.resilience import guarded_call, guarded_call_async, mark_degraded
+from app.config import (
+    OPENAI_MAX_CONCURRENCY,
+    INSIGHTS_CACHE_SIZE,
+    INSIGHTS_CACHE_TTL,
+)
+from app.constants.languages import SUPPORTED_LANGUAGES
+from app.instrumentation import span
+from app.services.result_cache import InMemoryCache, ResultCache
 
-def generate_financial_insights(score: int, metrics: dict, language="en"):
+MODEL = "gpt-4o-mini"
+
+# Caps in-flight completions per worker, for both the sync and async paths
+_sync_slots = threading.BoundedSemaphore(OPENAI_MAX_CONCURRENCY)
+_async_slots = asyncio.Semaphore(OPENAI_MAX_CONCURRENCY)
+
+_inflight = {}
+
+insights_cache = ResultCache(InMemoryCache(maxsize=INSIGHTS_CACHE_SIZE, ttl=INSIGHTS_CACHE_TTL))
+
+PROMPT_METRICS = ["revenue", "expenses", "profit_margin", "cash_balance", "runway_months"]
+
+
+def insights_cache_key(score: int, metrics: dict, language="en"):
+    # Round so that tiny float differences still share a cached completion
+    rounded = {
+        k: round(float(metrics[k]), 1) if metrics.get(k) is not None else None
+        for k in PROMPT_METRICS
+    }
+    payload = json.dumps([score, rounded, language], sort_keys=True)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def build_prompt(score: int, metrics: dict, language="en"):
     prompt = f"""
 You are a financial advisor for small businesses.
 
@@ -23,24 +57,92 @@ Explain:
 3. Top 3 improvements
 Use very simple language.
 """
+    if language != "en":
+        prompt += f"Respond in {SUPPORTED_LANGUAGES.get(language, 'English')}.\n"
 
-    try:
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[{"role": "user", "content": prompt}]
+    return prompt
+
+
+def fallback_insights(score: int):
+    return (
+        "AI insights are temporarily unavailable.\n\n"
+        "Basic interpretation:\n"
+        f"- Financial Health Score: {score}\n"
+        "- Review expenses and cash flow carefully.\n"
+        "- Ensure at least 6 months of cash runway.\n"
+        "- Improve profit margins and reduce fixed costs."
+    )
+
+
+def generate_financial_insights(score: int, metrics: dict, language="en", llm_client=None):
+    key = insights_cache_key(score, metrics, language)
+
+    cached = insights_cache.lookup(key)
+    if cached is not None:
+        return cached
+
+    def complete(timeout):
+        client = llm_client or get_client()
+        return client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": build_prompt(score, metrics, language)}],
+            timeout=timeout
         )
 
-        return response.choices[0].message.content
+    try:
+        with _sync_slots, span("llm.insights"):
+            response = guarded_call(complete)
+        text = response.choices[0].message.content
+    except Exception as e:
+        logging.error(f"AI insight generation failed: {e}")
+        mark_degraded()
+
+        # ✅ SAFE FALLBACK (CRITICAL) - not cached, so the next call retries
+        return fallback_insights(score)
+
+    insights_cache.store(key, text)
+    return text
+
+
+async def generate_financial_insights_async(score: int, metrics: dict, language="en", llm_client=None):
+    key = insights_cache_key(score, metrics, language)
 
+    cached = insights_cache.lookup(key)
+    if cached is not None:
+        return cached
+
+    # Identical concurrent requests share one completion
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_complete_async(llm_client, key, score, metrics, language))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    text, fell_back = await asyncio.shield(task)
+    # Each request that got the fallback is marked, not just the one that made the call
+    if fell_back:
+        mark_degraded()
+    return text
+
+
+async def _complete_async(llm_client, key, score, metrics, language):
+    """(text, whether it is the fallback) for one completion shared by every waiting request."""
+    def complete(timeout):
+        client = llm_client or get_async_client()
+        return client.chat.completions.create(
+            model=MODEL,
+            messages=[{"role": "user", "content": build_prompt(score, metrics, language)}],
+            timeout=timeout
+        )
+
+    try:
+        async with _async_slots:
+            with span("llm.insights"):
+                response = await guarded_call_async(complete)
+        text = response.choices[0].message.content
     except Exception as e:
         logging.error(f"AI insight generation failed: {e}")
+        return fallback_insights(score), True
 
-        # ✅ SAFE FALLBACK (CRITICAL)
-        return (
-            "AI insights are temporarily unavailable.\n\n"
-            "Basic interpretation:\n"
-            f"- Financial Health Score: {score}\n"
-            "- Review expenses and cash flow carefully.\n"
-            "- Ensure at least 6 months of cash runway.\n"
-            "- Improve profit margins and reduce fixed costs."
-        )
\ No newline at end of file
+    insights_cache.store(key, text)
+    return text, False
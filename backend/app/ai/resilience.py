@@ -0,0 +1,192 @@
+import asyncio
+import contextvars
+import threading
+import time
+
+from app.config import (
+    OPENAI_TIMEOUT,
+    LLM_BREAKER_FAILURES,
+    LLM_BREAKER_RESET_SECONDS,
+    LLM_REQUEST_BUDGET,
+)
+from app.instrumentation import llm_breaker_state, llm_calls
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class LLMUnavailable(Exception):
+    """Raised instead of calling the API; callers treat it like any failed completion."""
+
+
+class CircuitBreaker:
+    """Opens after `failures` consecutive errors, so callers fall back at once.
+
+    After `reset_seconds` one probe call is let through (half-open): success
+    closes the breaker, failure opens it for another `reset_seconds`.
+    """
+
+    def __init__(self, name: str, failures: int, reset_seconds: float, clock=time.monotonic):
+        self.name = name
+        self.failures = failures
+        self.reset_seconds = reset_seconds
+        self.clock = clock
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._lock = threading.Lock()
+        llm_breaker_state.set(STATE_VALUES[CLOSED], name)
+
+    def _set_state(self, state: str):
+        self.state = state
+        llm_breaker_state.set(STATE_VALUES[state], self.name)
+
+    def allow(self):
+        with self._lock:
+            if self.state == OPEN and self.clock() - self.opened_at >= self.reset_seconds:
+                self._set_state(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            self._probing = False
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.consecutive_failures += 1
+            self._probing = False
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failures:
+                self.opened_at = self.clock()
+                self._set_state(OPEN)
+
+
+# One breaker for the API: insights and translations fail together on an outage or quota
+openai_breaker = CircuitBreaker("openai", LLM_BREAKER_FAILURES, LLM_BREAKER_RESET_SECONDS)
+
+
+class RequestBudget:
+    """Per-request LLM allowance, shared by reference with the threads doing the request's work."""
+
+    __slots__ = ("deadline", "degraded")
+
+    def __init__(self, seconds: float):
+        self.deadline = time.monotonic() + seconds
+        # Set when any LLM call fell back, so the response isn't cached as if it were complete
+        self.degraded = False
+
+
+current_budget = contextvars.ContextVar("current_budget", default=None)
+
+
+def call_timeout():
+    """Seconds the next completion may take: the client timeout, cut to what's left of the budget."""
+    budget = current_budget.get()
+    if budget is None:
+        return OPENAI_TIMEOUT
+    return min(OPENAI_TIMEOUT, budget.deadline - time.monotonic())
+
+
+def llm_degraded():
+    """Whether an LLM call in the current request has fallen back so far."""
+    budget = current_budget.get()
+    return budget is not None and budget.degraded
+
+
+def mark_degraded():
+    """Record that the current request served a fallback instead of LLM output."""
+    budget = current_budget.get()
+    if budget is not None:
+        budget.degraded = True
+
+
+def _admit(breaker: CircuitBreaker):
+    timeout = call_timeout()
+    if timeout <= 0:
+        mark_degraded()
+        llm_calls.inc(breaker.name, "budget_exhausted")
+        raise LLMUnavailable("LLM time budget for this request is spent")
+    if not breaker.allow():
+        mark_degraded()
+        llm_calls.inc(breaker.name, "rejected")
+        raise LLMUnavailable(f"{breaker.name} circuit is open")
+    return timeout
+
+
+def _failed(breaker: CircuitBreaker, error: Exception):
+    mark_degraded()
+    breaker.record_failure()
+    # openai raises its own APITimeoutError; it isn't imported here to keep boot light
+    timed_out = isinstance(error, TimeoutError) or type(error).__name__ == "APITimeoutError"
+    llm_calls.inc(breaker.name, "timeout" if timed_out else "failure")
+
+
+def guarded_call(fn, breaker: CircuitBreaker = openai_breaker):
+    """Run `fn(timeout)` under the breaker and the request's budget; `fn` must honour the timeout."""
+    timeout = _admit(breaker)
+    try:
+        result = fn(timeout)
+    except BaseException as e:
+        # Cancellation included: a probe that never reports back would hold the breaker half-open
+        _failed(breaker, e)
+        raise
+    breaker.record_success()
+    llm_calls.inc(breaker.name, "success")
+    return result
+
+
+async def guarded_call_async(fn, breaker: CircuitBreaker = openai_breaker):
+    """Async guarded_call; the timeout is also enforced here, whatever the client does with it."""
+    timeout = _admit(breaker)
+    try:
+        result = await asyncio.wait_for(fn(timeout), timeout)
+    except BaseException as e:
+        _failed(breaker, e)
+        raise
+    breaker.record_success()
+    llm_calls.inc(breaker.name, "success")
+    return result
+
+
+class LLMBudgetMiddleware:
+    """Gives every HTTP request LLM_REQUEST_BUDGET seconds for all of its LLM calls together.
+
+    Compute-pool and job threads run in a copy of the request context, so
+    work a request waits on shares its budget. A response built from a
+    fallback is sent with no-store and without its ETag, so clients fetch
+    the real text once the API recovers.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = RequestBudget(LLM_REQUEST_BUDGET)
+        token = current_budget.set(budget)
+
+        async def send_uncached_if_degraded(message):
+            if message["type"] == "http.response.start" and budget.degraded:
+                headers = [
+                    (name, value) for name, value in message.get("headers", [])
+                    if name.lower() not in (b"etag", b"cache-control")
+                ]
+                headers.append((b"cache-control", b"no-store"))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_uncached_if_degraded)
+        finally:
+            current_budget.reset(token)
@@ -0,0 +1,17 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ThreadPoolExecutor
+
+from app.config import COMPUTE_WORKERS
+
+# Bounded pool for DB reads + pandas/NumPy work, kept separate from the
+# request threadpool so a burst of dashboards cannot starve other handlers.
+compute_pool = ThreadPoolExecutor(max_workers=COMPUTE_WORKERS, thread_name_prefix="compute")
+
+
+async def run_compute(fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    # Carry the request context (metrics, spans) over to the worker thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(compute_pool, functools.partial(context.run, fn, *args, **kwargs))
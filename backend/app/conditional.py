@@ -0,0 +1,67 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.services.benchmark_registry import get_registry
+from app.services.data_version import data_fingerprint
+from app.services.rules import rules_version
+
+# Per-business data, so never in shared caches; clients keep it but revalidate every time
+CACHE_CONTROL = "private, no-cache"
+
+
+def response_etag(db, business_id: int, request: Request):
+    """Strong ETag for a GET: the route and its query plus the data it reads from."""
+    query = request.query_params
+    parts = [request.url.path, sorted(query.multi_items()), data_fingerprint(db, business_id), rules_version()]
+    if "percentile" in (query.get("mode"), query.get("benchmark_mode")):
+        # Peer percentiles move with other businesses' data too
+        parts.append(get_registry(db, with_sketches=True).version)
+    return '"' + hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str):
+    if not if_none_match:
+        return False
+    # If-None-Match uses the weak comparison, so W/"x" matches "x"
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def _revalidate(request: Request, response: Response, etag: str):
+    headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return headers
+
+
+def conditional_get(request: Request, response: Response, business_id: int = 1, db: Session = Depends(get_db)):
+    """Dependency answering If-None-Match with 304 before the route loads or computes anything.
+
+    Otherwise the ETag and Cache-Control headers are set on the response
+    (and returned, for routes that build their own Response).
+    """
+    return _revalidate(request, response, response_etag(db, business_id, request))
+
+
+def weak_conditional_get(request: Request, response: Response, business_id: int = 1, db: Session = Depends(get_db)):
+    """conditional_get with a weak ETag, for bodies that are equivalent but not byte-identical on every render."""
+    return _revalidate(request, response, "W/" + response_etag(db, business_id, request))
+
+
+def seeded_conditional_get(
+    request: Request,
+    response: Response,
+    business_id: int = 1,
+    seed: Optional[int] = None,
+    db: Session = Depends(get_db)
+):
+    # Unseeded simulations differ on every call, so only a fixed seed can be revalidated
+    if seed is None:
+        response.headers["Cache-Control"] = "no-store"
+        return {}
+    return conditional_get(request, response, business_id, db)
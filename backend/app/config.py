@@ -4,5 +4,70 @@ from dotenv import load_dotenv
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
-JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
\ No newline at end of file
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+OPENAI_TIMEOUT = float(os.getenv("OPENAI_TIMEOUT", "20"))
+OPENAI_MAX_CONCURRENCY = int(os.getenv("OPENAI_MAX_CONCURRENCY", "8"))
+# Total seconds one request may spend waiting on the LLM, across all its calls
+LLM_REQUEST_BUDGET = float(os.getenv("LLM_REQUEST_BUDGET", "8"))
+# The same allowance for one background job (reports, bulk reports), counted from when it starts
+LLM_JOB_BUDGET = float(os.getenv("LLM_JOB_BUDGET", "120"))
+# Consecutive failures that open the breaker, and seconds before it lets a probe through
+LLM_BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+LLM_BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY")
+
+COMPUTE_WORKERS = int(os.getenv("COMPUTE_WORKERS", "4"))
+
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", "50000"))
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", "2"))
+
+RESULT_CACHE_SIZE = int(os.getenv("RESULT_CACHE_SIZE", "1024"))
+RESULT_CACHE_TTL = float(os.getenv("RESULT_CACHE_TTL", "900"))
+
+INSIGHTS_CACHE_SIZE = int(os.getenv("INSIGHTS_CACHE_SIZE", "2048"))
+INSIGHTS_CACHE_TTL = float(os.getenv("INSIGHTS_CACHE_TTL", "86400"))
+
+TRANSLATION_CACHE_SIZE = int(os.getenv("TRANSLATION_CACHE_SIZE", "4096"))
+
+SCORING_RULES_PATH = os.getenv(
+    "SCORING_RULES_PATH",
+    os.path.join(os.path.dirname(__file__), "rules", "scoring_rules.json")
+)
+
+CATEGORY_RULES_PATH = os.getenv(
+    "CATEGORY_RULES_PATH",
+    os.path.join(os.path.dirname(__file__), "rules", "category_rules.json")
+)
+
+FORECAST_ALPHA = float(os.getenv("FORECAST_ALPHA", "0.5"))
+FORECAST_BETA = float(os.getenv("FORECAST_BETA", "0.3"))
+FORECAST_STATE_PATH = os.getenv("FORECAST_STATE_PATH", "forecast_state.npz")
+
+MAX_SCENARIO_PATHS = int(os.getenv("MAX_SCENARIO_PATHS", "100000"))
+# paths x months per simulation; each cell costs ~40 bytes at peak (80 MB at the default)
+MAX_SCENARIO_CELLS = int(os.getenv("MAX_SCENARIO_CELLS", "2000000"))
+
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "2"))
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "256"))
+# Optional TTF with Devanagari glyphs for non-English reports
+REPORT_FONT_PATH = os.getenv("REPORT_FONT_PATH") or None
+
+# Seconds between rebuilds of the per-industry peer percentile sketches
+BENCHMARK_SKETCH_TTL = float(os.getenv("BENCHMARK_SKETCH_TTL", "3600"))
+
+# Request/stage metrics at /metrics; when off, spans are no-ops and no middleware is installed
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+# Adds a Server-Timing header with per-stage durations (visible to clients, so off by default)
+SERVER_TIMING = os.getenv("SERVER_TIMING", "false").lower() == "true"
+
+# Seconds between keepalive comments on an idle /analysis/stream connection
+STREAM_KEEPALIVE_SECONDS = float(os.getenv("STREAM_KEEPALIVE_SECONDS", "15"))
+
+# Per-business Arrow snapshots that bulk analytics read instead of the database
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "snapshots")
+SNAPSHOT_BATCH_ROWS = int(os.getenv("SNAPSHOT_BATCH_ROWS", "200000"))
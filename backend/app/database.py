@@ -1,7 +1,64 @@
+import threading
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import DATABASE_URL
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from app.config import (
+    DATABASE_URL,
+    DB_POOL_SIZE,
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+)
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_engine():
+    """The shared engine, created (and its driver imported) on first use rather than at import."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                if not DATABASE_URL:
+                    raise RuntimeError("DATABASE_URL is not set")
+
+                pool_options = {"pool_pre_ping": DB_POOL_PRE_PING}
+                if not DATABASE_URL.startswith("sqlite"):
+                    pool_options.update(
+                        pool_size=DB_POOL_SIZE,
+                        max_overflow=DB_MAX_OVERFLOW,
+                        pool_recycle=DB_POOL_RECYCLE,
+                    )
+                _engine = create_engine(DATABASE_URL, **pool_options)
+    return _engine
+
+
+def __getattr__(name):
+    # `from app.database import engine` keeps working, but only builds the engine when asked for
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class LazySession(Session):
+    def get_bind(self, mapper=None, **kwargs):
+        if self.bind is None:
+            self.bind = get_engine()
+        return super().get_bind(mapper, **kwargs)
+
+
+SessionLocal = sessionmaker(class_=LazySession)
+Base = declarative_base()
+
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
-Base = declarative_base()
\ No newline at end of file
+def get_db():
+    """FastAPI dependency: one session per request, always closed (and rolled back on error)."""
+    db = SessionLocal()
+    try:
+        yield db
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
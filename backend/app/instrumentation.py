@@ -0,0 +1,259 @@
+import bisect
+import contextvars
+import threading
+import time
+from contextlib import nullcontext
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import METRICS_ENABLED, SERVER_TIMING
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 1000, 10_000, 100_000, 1_000_000, 10_000_000)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        # One slot per bucket plus +Inf, then sum and count; made cumulative on render
+        slot = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 3)
+            series[slot] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._series.items()}
+
+        for label_values, series in sorted(snapshot.items()):
+            labels = _labels(self.labels, label_values)
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{_labels(self.labels, label_values, le=bound)} {cumulative}')
+            lines.append(f"{self.name}_sum{labels} {series[-2]}")
+            lines.append(f"{self.name}_count{labels} {series[-1]}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+
+    def set(self, value, *label_values):
+        self._values[label_values] = value
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} gauge"]
+        for label_values, value in sorted(dict(self._values).items()):
+            lines.append(f"{self.name}{_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for label_values, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_labels(self.labels, label_values)} {value}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values, **extra):
+    pairs = [*zip(names, values), *extra.items()]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+request_seconds = Histogram(
+    "sme_http_request_duration_seconds", "HTTP request latency", ("method", "route", "status")
+)
+stage_seconds = Histogram(
+    "sme_stage_duration_seconds", "Time spent in one pipeline stage", ("stage",)
+)
+request_queries = Histogram(
+    "sme_request_sql_queries", "SQL statements executed per request", ("route",), COUNT_BUCKETS
+)
+request_rows = Histogram(
+    "sme_request_sql_rows", "Rows read or written per request", ("route",), COUNT_BUCKETS
+)
+sql_queries = Counter("sme_sql_queries_total", "SQL statements executed")
+boot_seconds = Gauge(
+    "sme_boot_seconds", "Seconds from app.main import to each boot phase", ("phase",)
+)
+llm_breaker_state = Gauge(
+    "sme_llm_breaker_state", "LLM circuit breaker state: 0 closed, 1 half-open, 2 open", ("breaker",)
+)
+llm_calls = Counter(
+    "sme_llm_calls_total", "LLM calls by outcome (success, failure, timeout, rejected, budget_exhausted)",
+    ("breaker", "outcome")
+)
+
+METRICS = [
+    request_seconds, stage_seconds, request_queries, request_rows, sql_queries, boot_seconds,
+    llm_breaker_state, llm_calls
+]
+
+
+class RequestStats:
+    """Per-request accumulator; shared by reference with compute-pool threads."""
+
+    __slots__ = ("stages", "queries", "rows", "_lock")
+
+    def __init__(self):
+        self.stages = {}
+        self.queries = 0
+        self.rows = 0
+        self._lock = threading.Lock()
+
+    def add_stage(self, name: str, seconds: float):
+        with self._lock:
+            self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    def add_query(self, rows: int = 0):
+        with self._lock:
+            self.queries += 1
+            self.rows += rows
+
+    def add_rows(self, rows: int):
+        with self._lock:
+            self.rows += rows
+
+
+current_request = contextvars.ContextVar("current_request", default=None)
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter() - self.started
+        stage_seconds.observe(elapsed, self.name)
+        stats = current_request.get()
+        if stats is not None:
+            stats.add_stage(self.name, elapsed)
+        return False
+
+
+_NO_SPAN = nullcontext()
+
+
+def span(name: str):
+    """Time a block as one pipeline stage, e.g. `with span("db.rollup"): ...`."""
+    if not METRICS_ENABLED:
+        return _NO_SPAN
+    return _Span(name)
+
+
+def record_rows(rows: int):
+    """Attribute rows read outside SQLAlchemy's cursor counts (COPY, read_sql) to the request."""
+    if not METRICS_ENABLED:
+        return
+    stats = current_request.get()
+    if stats is not None:
+        stats.add_rows(rows)
+
+
+def instrument_engines():
+    # Registered on the Engine class, so it covers the lazily created app engine too
+    @event.listens_for(Engine, "after_cursor_execute")
+    def count_query(conn, cursor, statement, parameters, context, executemany):
+        sql_queries.inc()
+        stats = current_request.get()
+        if stats is not None:
+            # rowcount is only meaningful for writes (and -1 when the driver can't tell)
+            written = cursor.rowcount if context is not None and not context.isddl and (
+                context.isinsert or context.isupdate or context.isdelete
+            ) else 0
+            stats.add_query(max(written, 0))
+
+
+def server_timing(stats: RequestStats):
+    parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in stats.stages.items()]
+    parts.append(f'sql;desc="{stats.queries} queries, {stats.rows} rows"')
+    return ", ".join(parts)
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware, so streaming responses are passed through untouched."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = current_request.set(stats)
+        started = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if SERVER_TIMING:
+                    headers = list(message.get("headers", []))
+                    headers.append((b"server-timing", server_timing(stats).encode("latin-1")))
+                    message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_request.reset(token)
+            # Label by route template, never the raw path, to keep cardinality bounded
+            route = getattr(scope.get("route"), "path", "unmatched")
+            request_seconds.observe(time.perf_counter() - started, scope["method"], route, status)
+            request_queries.observe(stats.queries, route)
+            request_rows.observe(stats.rows, route)
+
+
+def render_metrics(extra_lines=()):
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    lines.extend(extra_lines)
+    return "\n".join(lines) + "\n"
@@ -1,6 +1,17 @@
+import time
+
+BOOT_STARTED = time.perf_counter()
+
+import logging
+
 from fastapi import FastAPI
-from app.routes import upload, analysis, reports
+from app.routes import upload, analysis, reports, portfolio, metrics
 from fastapi.middleware.cors import CORSMiddleware
+from app.ai.resilience import LLMBudgetMiddleware
+from app.config import METRICS_ENABLED
+from app.database import SessionLocal
+from app.instrumentation import MetricsMiddleware, boot_seconds, instrument_engines
+from app.services.benchmark_registry import get_registry
 
 
 
@@ -14,10 +25,39 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],  # lets the dashboard send If-None-Match itself
 )
+app.add_middleware(LLMBudgetMiddleware)
 app.include_router(upload.router)
 app.include_router(analysis.router)
 app.include_router(reports.router)
+app.include_router(portfolio.router)
+
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics.router)
+    instrument_engines()
+
+boot_seconds.set(round(time.perf_counter() - BOOT_STARTED, 4), "import")
+
+@app.on_event("startup")
+def preload_benchmarks():
+    # Warm the registry so the first request doesn't pay for it; a cold
+    # database just means it loads on first use instead.
+    db = SessionLocal()
+    try:
+        get_registry(db)
+    except Exception:
+        logging.exception("Benchmark registry preload failed; it will load on first use")
+    finally:
+        db.close()
+
+@app.on_event("startup")
+def record_boot_time():
+    # Registered last, so this covers imports plus every startup hook above
+    elapsed = time.perf_counter() - BOOT_STARTED
+    boot_seconds.set(round(elapsed, 4), "ready")
+    logging.getLogger("uvicorn.error").info(f"Application booted in {elapsed:.3f}s")
 
 @app.get("/")
 def root():
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, String
+from app.database import Base
+
+class Business(Base):
+    __tablename__ = "businesses"
+
+    id = Column(Integer, primary_key=True)  # matches business_id on transactions, loans and gst_returns
+    name = Column(String)
+    industry = Column(String, index=True)
@@ -0,0 +1,8 @@
+from sqlalchemy import Column, Integer
+from app.database import Base
+
+class DataVersion(Base):
+    __tablename__ = "data_versions"
+
+    business_id = Column(Integer, primary_key=True)  # 0 = data shared by all businesses
+    version = Column(Integer, nullable=False, default=0)
@@ -1,12 +1,19 @@
-from sqlalchemy import Column, Integer, Float, String, Date
+from sqlalchemy import Column, Integer, Float, String, Date, Index
 from app.database import Base
 
 class Transaction(Base):
     __tablename__ = "transactions"
+    __table_args__ = (
+        Index("ix_transactions_business_date", "business_id", "date"),
+        # Re-uploads of the same statement collide here instead of duplicating rows
+        Index("uq_transactions_business_fingerprint", "business_id", "fingerprint", unique=True),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(Date)
     description = Column(String)
     amount = Column(Float)
     category = Column(String)
-    business_id = Column(Integer)
\ No newline at end of file
+    category_rules = Column(String(16))  # dictionary version that assigned category; NULL if the upload supplied it
+    business_id = Column(Integer)
+    fingerprint = Column(String(32))  # see app.services.ingest.fingerprint_chunk
\ No newline at end of file
@@ -9,4 +9,4 @@ class GSTReturn(Base):
     output_gst = Column(Float)  # GST collected on sales
     input_gst = Column(Float)   # GST paid on purchases
     filed = Column(Integer)     # 1 = filed, 0 = not filed
-    business_id = Column(Integer)
\ No newline at end of file
+    business_id = Column(Integer, index=True)
\ No newline at end of file
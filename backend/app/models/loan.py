@@ -8,4 +8,4 @@ class Loan(Base):
     lender = Column(String)
     monthly_emi = Column(Float)
     outstanding_amount = Column(Float)
-    business_id = Column(Integer)
\ No newline at end of file
+    business_id = Column(Integer, index=True)
\ No newline at end of file
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, Float, String, UniqueConstraint
+from app.database import Base
+
+class MonthlyRollup(Base):
+    __tablename__ = "monthly_rollups"
+    __table_args__ = (
+        UniqueConstraint("business_id", "month", name="uq_monthly_rollups_business_month"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    business_id = Column(Integer, nullable=False)
+    month = Column(String, nullable=False)  # e.g. 2024-06
+    inflow = Column(Float, default=0)       # sum of positive amounts
+    outflow = Column(Float, default=0)      # sum of negative amounts, stored as a positive number
+    net = Column(Float, default=0)          # inflow - outflow
+    row_count = Column(Integer, default=0)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Text, UniqueConstraint
+from app.database import Base
+
+class Translation(Base):
+    __tablename__ = "translations"
+    __table_args__ = (
+        UniqueConstraint("source_hash", "language", name="uq_translations_source_language"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_hash = Column(String(64), nullable=False)  # sha256 of source_text
+    language = Column(String(8), nullable=False)
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
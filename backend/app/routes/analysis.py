@@ -1,212 +1,199 @@
-from fastapi import APIRouter
-from app.database import SessionLocal
-from app.models.financial import Transaction
-from app.services.financial_analysis import compute_financial_metrics, financial_health_score
-import pandas as pd
-from app.ai.financial_insights import generate_financial_insights
-from app.models.loan import Loan
-from app.services.credit_analysis import calculate_credit_metrics
-from app.services.cashflow_forecast import forecast_cashflow
-from app.services.cashflow_forecast import runway_analysis
-from app.models.gst import GSTReturn
-from app.services.gst_analysis import analyze_gst_compliance
-from app.models.benchmark import IndustryBenchmark
-from app.services.kpi_calculator import calculate_business_kpis
-from app.services.benchmark_analysis import compare_with_benchmark
-from app.services.product_recommendation import recommend_financial_products
-from app.services.translator import translate_text
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.concurrency import run_compute
+from app.conditional import conditional_get, seeded_conditional_get
+from app.config import MAX_SCENARIO_PATHS, MAX_SCENARIO_CELLS
+from app.database import get_db
+from app.instrumentation import span
+from app.ai.financial_insights import generate_financial_insights_async
+from app.services.assessment import load_and_assess, parse_sections
+from app.services.dashboard_stream import dashboard_events
+from app.services.data_access import load_loans
+from app.services.forecast_engine import METHODS as FORECAST_METHODS
+from app.services.monthly_rollup import load_monthly
+from app.services.scenarios import run_scenario
 
 router = APIRouter(prefix="/analysis")
 
-@router.get("/financial-health")
-def financial_health():
-    db = SessionLocal()
-    transactions = db.query(Transaction).all()
-    db.close()
 
-    if not transactions:
-        return {"error": "No financial data found"}
-
-    df = pd.DataFrame([{
-        "date": t.date,
-        "amount": t.amount
-    } for t in transactions])
-
-    df["date"] = pd.to_datetime(df["date"])
-
-    metrics = compute_financial_metrics(df)
-    score = financial_health_score(metrics)
-
-    return {
-        "score": score,
-        "metrics": metrics
-    }
-
-@router.get("/financial-insights")
-def financial_insights():
-    db = SessionLocal()
-    transactions = db.query(Transaction).all()
-    db.close()
-
-    if not transactions:
-        return {"error": "No financial data found"}
-
-    df = pd.DataFrame([{
-        "date": t.date,
-        "amount": t.amount
-    } for t in transactions])
-
-    df["date"] = pd.to_datetime(df["date"])
-
-    metrics = compute_financial_metrics(df)
-    score = financial_health_score(metrics)
-
-    insights = generate_financial_insights(score, metrics)
-
-    return {
-        "score": score,
-        "metrics": metrics,
-        "insights": insights
-    }
-
-@router.get("/creditworthiness")
-def creditworthiness():
-    db = SessionLocal()
-
-    transactions = db.query(Transaction).all()
-    loans = db.query(Loan).all()
-
-    db.close()
-
-    if not transactions:
-        return {"error": "No financial data found"}
-
-    tx_df = pd.DataFrame([{
-        "date": t.date,
-        "amount": t.amount
-    } for t in transactions])
-
-    tx_df["date"] = pd.to_datetime(tx_df["date"])
-
-    loan_df = pd.DataFrame([{
-        "monthly_emi": l.monthly_emi
-    } for l in loans])
-
-    metrics = calculate_credit_metrics(tx_df, loan_df)
-
-    return metrics
-
-@router.get("/cashflow-forecast")
-def cashflow_forecast(months: int = 6):
-    db = SessionLocal()
-    transactions = db.query(Transaction).all()
-    db.close()
-
-    if not transactions:
-        return {"error": "No financial data found"}
-
-    df = pd.DataFrame([{
-        "date": t.date,
-        "amount": t.amount
-    } for t in transactions])
-
-    df["date"] = pd.to_datetime(df["date"])
-
-    forecast = forecast_cashflow(df, months_ahead=months)
-    runway = runway_analysis(forecast)
-
-    return {
-        **forecast,
-        **runway
-    }
-
-@router.get("/gst-compliance")
-def gst_compliance(lang: str = "en"):
-    db = SessionLocal()
-    gst_data = db.query(GSTReturn).all()
-    db.close()
-
-    if not gst_data:
-        return {"error": "No GST data found"}
+def date_window(
+    start: Optional[date] = Query(None, alias="from"),
+    end: Optional[date] = Query(None, alias="to")
+):
+    """Optional ?from=YYYY-MM-DD&to=YYYY-MM-DD (inclusive) accepted by every analysis route."""
+    if start and end and start > end:
+        raise HTTPException(status_code=422, detail="'from' must not be after 'to'")
+    return {"start": start, "end": end}
+
+
+async def with_insights(health: dict, lang: str):
+    if "error" in health:
+        return health
+
+    insights = await generate_financial_insights_async(health["score"], health["metrics"], lang)
+    return {**health, "insights": insights}
+
+@router.get("/assessment", dependencies=[Depends(conditional_get)])
+async def assessment(
+    business_id: int = 1,
+    sections: str = None,
+    industry: str = "Retail",
+    months: int = 6,
+    lang: str = "en",
+    model: str = "sma",
+    benchmark_mode: str = Query("average", pattern="^(average|percentile)$"),
+    window: dict = Depends(date_window),
+    db: Session = Depends(get_db)
+):
+    try:
+        selected = parse_sections(sections)
+    except ValueError as e:
+        return {"error": str(e)}
+
+    if model not in FORECAST_METHODS:
+        return {"error": f"Unknown forecast model: {model}"}
+
+    # The LLM call runs on the async client; everything else shares one
+    # pass over the loaded frames on the compute pool.
+    sync_sections = [s for s in selected if s != "insights"]
+    if "insights" in selected and "health" not in sync_sections:
+        sync_sections.append("health")
+
+    result = await run_compute(
+        load_and_assess, db, business_id, sync_sections,
+        industry=industry, months=months, lang=lang, model=model, benchmark_mode=benchmark_mode, **window
+    )
 
-    df = pd.DataFrame([{
-        "period": g.period,
-        "output_gst": g.output_gst,
-        "input_gst": g.input_gst,
-        "filed": g.filed
-    } for g in gst_data])
+    if "insights" in selected:
+        result = dict(result)
+        result["insights"] = await with_insights(result["health"], lang)
+        if "health" not in selected:
+            del result["health"]
 
-    result = analyze_gst_compliance(df)
-    if lang != "en":
-        result["warnings"] = [
-            translate_text(w, lang) for w in result["warnings"]
-        ]
     return result
 
-@router.get("/industry-benchmark")
-def industry_benchmark(industry: str = "Retail"):
-    db = SessionLocal()
-
-    benchmark = db.query(IndustryBenchmark)\
-        .filter(IndustryBenchmark.industry == industry)\
-        .first()
-
-    if not benchmark:
-        return {"error": "Industry benchmark not found"}
-
-    # reuse previous metrics logic
-    df = pd.read_sql("SELECT * FROM transactions", db.bind)
-    if not df.empty:
-        df['date'] = pd.to_datetime(df['date'])
-    metrics = compute_financial_metrics(df)
-
-    df_2 = pd.read_sql("SELECT * FROM loans", db.bind)
-    dscr = calculate_credit_metrics(
-        df,
-        df_2,
+@router.get("/financial-health", dependencies=[Depends(conditional_get)])
+async def financial_health(
+    business_id: int = 1,
+    window: dict = Depends(date_window),
+    db: Session = Depends(get_db)
+):
+    result = await run_compute(load_and_assess, db, business_id, ["health"], **window)
+    return result["health"]
+
+@router.get("/financial-insights", dependencies=[Depends(conditional_get)])
+async def financial_insights(
+    business_id: int = 1,
+    lang: str = "en",
+    window: dict = Depends(date_window),
+    db: Session = Depends(get_db)
+):
+    result = await run_compute(load_and_assess, db, business_id, ["health"], **window)
+    return await with_insights(result["health"], lang)
+
+@router.get("/creditworthiness", dependencies=[Depends(conditional_get)])
+async def creditworthiness(
+    business_id: int = 1,
+    window: dict = Depends(date_window),
+    db: Session = Depends(get_db)
+):
+    result = await run_compute(load_and_assess, db, business_id, ["credit"], **window)
+    return result["credit"]
+
+@router.get("/cashflow-forecast", dependencies=[Depends(conditional_get)])
+async def cashflow_forecast(
+    months: int = 6,
+    business_id: int = 1,
+    model: str = "sma",
+    window: dict = Depends(date_window),
+    db: Session = Depends(get_db)
+):
+    if model not in FORECAST_METHODS:
+        return {"error": f"Unknown forecast model: {model}"}
+
+    result = await run_compute(
+        load_and_assess, db, business_id, ["forecast"], months=months, model=model, **window
+    )
+    return result["forecast"]
+
+@router.get("/gst-compliance", dependencies=[Depends(conditional_get)])
+async def gst_compliance(
+    lang: str = "en",
+    business_id: int = 1,
+    window: dict = Depends(date_window),
+    db: Session = Depends(get_db)
+):
+    result = await run_compute(load_and_assess, db, business_id, ["gst"], lang=lang, **window)
+    return result["gst"]
+
+@router.get("/industry-benchmark", dependencies=[Depends(conditional_get)])
+async def industry_benchmark(
+    industry: str = "Retail",
+    business_id: int = 1,
+    mode: str = Query("average", pattern="^(average|percentile)$"),
+    window: dict = Depends(date_window),
+    db: Session = Depends(get_db)
+):
+    result = await run_compute(
+        load_and_assess, db, business_id, ["benchmark"], industry=industry, benchmark_mode=mode, **window
+    )
+    return result["benchmark"]
+
+@router.get("/financial-products", dependencies=[Depends(conditional_get)])
+async def financial_products(
+    business_id: int = 1,
+    window: dict = Depends(date_window),
+    db: Session = Depends(get_db)
+):
+    result = await run_compute(load_and_assess, db, business_id, ["products"], **window)
+    return result["products"]
+
+@router.get("/scenarios", dependencies=[Depends(seeded_conditional_get)])
+async def scenarios(
+    business_id: int = 1,
+    paths: int = Query(10000, ge=100, le=MAX_SCENARIO_PATHS),
+    months: int = Query(24, ge=1, le=120),
+    revenue_drop: float = Query(0.0, ge=0, le=1),
+    added_emi: float = Query(0.0, ge=0),
+    seed: Optional[int] = None,
+    window: dict = Depends(date_window),
+    db: Session = Depends(get_db)
+):
+    # Memory grows with paths x months, so the product is capped, not just each bound
+    if paths * months > MAX_SCENARIO_CELLS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"paths x months must not exceed {MAX_SCENARIO_CELLS} (got {paths * months})"
+        )
+
+    def simulate():
+        monthly = load_monthly(db, business_id, **window)
+        if monthly.empty:
+            return {"error": "No financial data found"}
+
+        existing_emi = float(load_loans(db, business_id)["monthly_emi"].sum())
+        with span("compute.scenarios"):
+            return run_scenario(
+                monthly,
+                existing_emi=existing_emi,
+                paths=paths,
+                months=months,
+                revenue_drop=revenue_drop,
+                added_emi=added_emi,
+                seed=seed
+            )
+
+    return await run_compute(simulate)
+
+@router.get("/stream")
+async def stream(business_id: int = 1, last_event_id: Optional[str] = Header(None)):
+    # Server-sent events: health, forecast and credit now, then again after every upload
+    return StreamingResponse(
+        dashboard_events(business_id, last_event_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
-
-    kpis = calculate_business_kpis(metrics, dscr)
-    insights = compare_with_benchmark(kpis, benchmark)
-
-    db.close()
-
-    return {
-        "industry": industry,
-        "your_kpis": kpis,
-        "industry_average": {
-            "gross_margin": benchmark.avg_gross_margin,
-            "net_margin": benchmark.avg_net_margin,
-            "cashflow_margin": benchmark.avg_cashflow_margin,
-            "dscr": benchmark.avg_dscr
-        },
-        "insights": insights
-    }
-
-@router.get("/financial-products")
-def financial_products():
-    db = SessionLocal()
-
-    transactions = pd.read_sql("SELECT * FROM transactions", db.bind)
-    if not transactions.empty:
-        transactions['date'] = pd.to_datetime(transactions['date'])
-    loans = pd.read_sql("SELECT * FROM loans", db.bind)
-    gst = pd.read_sql("SELECT * FROM gst_returns", db.bind)
-
-    metrics = compute_financial_metrics(transactions)
-    dscr = calculate_credit_metrics(transactions, loans)
-
-    gst_score = 100
-    if not gst.empty:
-        unfiled = gst[gst["filed"] == 0]
-        if not unfiled.empty:
-            gst_score -= 30
-
-    products = recommend_financial_products(metrics, dscr, gst_score)
-
-    db.close()
-
-    return {
-        "recommended_products": products
-    }
-
@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.ai.financial_insights import insights_cache
+from app.instrumentation import render_metrics
+from app.services.report_jobs import report_cache
+from app.services.result_cache import result_cache
+from app.services.translator import phrase_cache
+
+router = APIRouter(tags=["Metrics"])
+
+CACHES = {
+    "results": result_cache,
+    "insights": insights_cache,
+    "translations": phrase_cache,
+    "reports": report_cache,
+}
+
+
+def cache_lines():
+    lines = []
+    for field in ("hits", "misses"):
+        name = f"sme_cache_{field}_total"
+        lines += [f"# HELP {name} Result cache {field}", f"# TYPE {name} counter"]
+        lines += [f'{name}{{cache="{cache}"}} {getattr(c, field)}' for cache, c in CACHES.items()]
+    return lines
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Prometheus text exposition format
+    return PlainTextResponse(
+        render_metrics(cache_lines()),
+        media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,22 @@
+from typing import List, Optional
+
+from fastapi import APIRouter, Query, Depends
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from app.database import get_db
+from app.services.portfolio import score_portfolio, iter_ndjson
+
+router = APIRouter(prefix="/portfolio", tags=["Portfolio"])
+
+@router.get("/scores")
+def portfolio_scores(business_id: Optional[List[int]] = Query(None), db: Session = Depends(get_db)):
+    scores, stats = score_portfolio(db, business_id)
+
+    return StreamingResponse(
+        iter_ndjson(scores),
+        media_type="application/x-ndjson",
+        headers={
+            "X-Businesses-Scored": str(stats["businesses"]),
+            "X-Businesses-Per-Second": str(stats["businesses_per_second"])
+        }
+    )
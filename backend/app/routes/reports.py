@@ -1,24 +1,58 @@
-from fastapi import APIRouter, Depends
-from fastapi.responses import FileResponse
-from app.services.report_generator import generate_pdf_report
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
+from app.conditional import weak_conditional_get
+from app.services.report_jobs import report_queue, submit_report, submit_bulk_reports
 
 router = APIRouter(prefix="/reports", tags=["Reports"])
 
+DOWNLOADS = {
+    "report": ("application/pdf", "SME_Financial_Report.pdf"),
+    "bulk_report": ("application/zip", "SME_Financial_Reports.zip"),
+}
+
+
+def job_download(job, headers=None):
+    media_type, filename = DOWNLOADS[job.kind]
+    return Response(
+        content=job.result,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"', **(headers or {})}
+    )
+
+# Weak ETag: the PDF is stamped with its render time, so re-renders of the same data differ byte for byte
 @router.get("/download")
-def download_report():
-
-    # normally you'd calculate this dynamically
-    summary = {
-        "Financial Health Score": 78,
-        "DSCR": 1.6,
-        "GST Compliance": "Medium Risk",
-        "Recommended Product": "Working Capital Loan"
-    }
-
-    file_path = generate_pdf_report(summary)
-
-    return FileResponse(
-        path=file_path,
-        filename="SME_Financial_Report.pdf",
-        media_type="application/pdf"
-    )
\ No newline at end of file
+async def download_report(business_id: int = 1, lang: str = "en", etag: dict = Depends(weak_conditional_get)):
+    job = submit_report(business_id, lang)
+    await asyncio.wrap_future(job.future)
+
+    if job.status != "completed":
+        raise HTTPException(status_code=500, detail=job.error or "Report generation failed")
+
+    return job_download(job, etag)
+
+@router.post("/jobs")
+def create_report_job(business_id: int = 1, lang: str = "en"):
+    return submit_report(business_id, lang).to_dict()
+
+@router.post("/bulk")
+def create_bulk_report_job(business_id: Optional[List[int]] = Query(None), lang: str = "en"):
+    return submit_bulk_reports(business_id, lang).to_dict()
+
+@router.get("/jobs/{job_id}")
+def report_job_status(job_id: str):
+    job = report_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@router.get("/jobs/{job_id}/download")
+def report_job_download(job_id: str):
+    job = report_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status != "completed":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+    return job_download(job)
@@ -1,26 +1,28 @@
-from fastapi import APIRouter, UploadFile, File
-import pandas as pd
-from app.database import SessionLocal
-from app.models.financial import Transaction
+from typing import Optional
 
-router = APIRouter(prefix="/upload")
+from fastapi import APIRouter, UploadFile, File, HTTPException, Response
+from app.services.upload_jobs import upload_queue, submit_upload, submit_recategorize
 
-@router.post("/")
-async def upload_csv(file: UploadFile = File(...)):
-    df = pd.read_csv(file.file)
+router = APIRouter(prefix="/upload")
 
-    db = SessionLocal()
-    for _, row in df.iterrows():
-        tx = Transaction(
-            date=row["date"],
-            description=row["description"],
-            amount=row["amount"],
-            category=row.get("category", "Uncategorized"),
-            business_id=1
-        )
-        db.add(tx)
+@router.post("/", status_code=202)
+def upload_csv(response: Response, business_id: int = 1, file: UploadFile = File(...)):
+    try:
+        job = submit_upload(file.file, business_id)
+    except ValueError as e:
+        response.status_code = 400
+        return {"error": str(e)}
+    return job.to_dict()
 
-    db.commit()
-    db.close()
+@router.post("/recategorize", status_code=202)
+def recategorize_transactions(business_id: Optional[int] = None):
+    # Without business_id every business is re-categorized
+    return submit_recategorize(business_id).to_dict()
 
-    return {"rows_inserted": len(df)}
\ No newline at end of file
+@router.get("/jobs/{job_id}")
+def upload_job_status(job_id: str):
+    job = upload_queue.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    # rows_inserted / rows_skipped / rows_rejected (or rows_scanned / rows_changed) once completed
+    return {**job.to_dict(), "result": job.result}
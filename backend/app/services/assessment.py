@@ -0,0 +1,215 @@
+import pandas as pd
+
+from app.ai.financial_insights import generate_financial_insights
+from app.ai.resilience import llm_degraded
+from app.instrumentation import span
+from app.services.data_access import load_loans, load_gst_returns
+from app.services.data_version import get_data_version
+from app.services.monthly_rollup import load_monthly
+from app.services.result_cache import result_cache, make_key
+from app.services.rules import rules_version
+from app.services.financial_analysis import compute_financial_metrics_from_monthly, financial_health_score
+from app.services.credit_analysis import calculate_credit_metrics_from_monthly
+from app.services.cashflow_forecast import forecast_cashflow_from_monthly, runway_analysis
+from app.services.gst_analysis import analyze_gst_compliance, gst_filing_score
+from app.services.kpi_calculator import calculate_business_kpis
+from app.services.benchmark_analysis import compare_with_benchmark
+from app.services.benchmark_registry import get_registry, industry_sketches, peer_percentiles
+from app.services.product_recommendation import recommend_financial_products
+from app.services.translator import translate_batch
+
+SECTIONS = ("health", "insights", "credit", "forecast", "gst", "benchmark", "products")
+
+NO_FINANCIAL_DATA = {"error": "No financial data found"}
+
+
+def parse_sections(sections: str = None):
+    if not sections:
+        return SECTIONS
+
+    requested = tuple(s.strip() for s in sections.split(",") if s.strip())
+    unknown = [s for s in requested if s not in SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown sections: {', '.join(unknown)}")
+
+    return requested
+
+
+def run_assessment(
+    monthly: pd.DataFrame,
+    loans_df: pd.DataFrame = None,
+    gst_df: pd.DataFrame = None,
+    sections=SECTIONS,
+    benchmark=None,
+    industry: str = "Retail",
+    months_ahead: int = 6,
+    lang: str = "en",
+    forecast_model: str = "sma",
+    peer_sketches=None
+):
+    """Run every requested analysis over one set of already-loaded frames.
+
+    Metrics, credit metrics and the health score are computed at most once
+    and shared by all sections that need them.
+    """
+    sections = set(sections)
+    loans_df = loans_df if loans_df is not None else pd.DataFrame()
+    gst_df = gst_df if gst_df is not None else pd.DataFrame()
+    has_data = not monthly.empty
+    result = {}
+
+    metrics = score = credit = None
+
+    if sections & {"health", "insights", "benchmark", "products"}:
+        with span("compute.financial_metrics"):
+            metrics = compute_financial_metrics_from_monthly(monthly)
+            score = financial_health_score(metrics)
+
+    if sections & {"credit", "benchmark", "products"}:
+        with span("compute.credit_metrics"):
+            credit = calculate_credit_metrics_from_monthly(monthly, loans_df)
+
+    if "health" in sections:
+        result["health"] = {"score": score, "metrics": metrics} if has_data else NO_FINANCIAL_DATA
+
+    if "insights" in sections:
+        result["insights"] = {
+            "score": score,
+            "metrics": metrics,
+            "insights": generate_financial_insights(score, metrics, language=lang)
+        } if has_data else NO_FINANCIAL_DATA
+
+    if "credit" in sections:
+        result["credit"] = credit if has_data else NO_FINANCIAL_DATA
+
+    if "forecast" in sections:
+        if has_data:
+            with span("compute.forecast"):
+                forecast = forecast_cashflow_from_monthly(monthly, months_ahead=months_ahead, model=forecast_model)
+                result["forecast"] = {**forecast, **runway_analysis(forecast)}
+        else:
+            result["forecast"] = NO_FINANCIAL_DATA
+
+    if "gst" in sections:
+        if gst_df.empty:
+            result["gst"] = {"error": "No GST data found"}
+        else:
+            with span("compute.gst"):
+                gst = analyze_gst_compliance(gst_df)
+            if lang != "en":
+                gst["warnings"] = translate_batch(gst["warnings"], lang)
+            result["gst"] = gst
+
+    if "benchmark" in sections:
+        if benchmark is None:
+            result["benchmark"] = {"error": "Industry benchmark not found"}
+        else:
+            with span("compute.benchmark"):
+                kpis = calculate_business_kpis(metrics, credit)
+            benchmark_result = {
+                "industry": industry,
+                "your_kpis": kpis,
+                "industry_average": {
+                    "gross_margin": benchmark.avg_gross_margin,
+                    "net_margin": benchmark.avg_net_margin,
+                    "cashflow_margin": benchmark.avg_cashflow_margin,
+                    "dscr": benchmark.avg_dscr
+                },
+            }
+            percentiles = None
+            if peer_sketches is not None:
+                with span("compute.percentiles"):
+                    percentiles = peer_percentiles(peer_sketches, kpis)
+                benchmark_result["percentiles"] = percentiles
+            benchmark_result["insights"] = compare_with_benchmark(kpis, benchmark, percentiles)
+            result["benchmark"] = benchmark_result
+
+    if "products" in sections:
+        result["products"] = {
+            "recommended_products": recommend_financial_products(
+                metrics, credit, gst_filing_score(gst_df)
+            )
+        }
+
+    return result
+
+
+def load_and_assess(
+    db,
+    business_id: int,
+    sections,
+    industry: str = "Retail",
+    months: int = 6,
+    lang: str = "en",
+    model: str = "sma",
+    benchmark_mode: str = "average",
+    start=None,
+    end=None
+):
+    """Load the monthly sums, loans, GST returns and benchmark once for all requested sections.
+
+    `start`/`end` restrict the ledger and GST returns to a date window; the
+    months are then summed by the database instead of read from the rollup.
+    Results are cached per business and data version, so repeat loads are a
+    single version lookup until the next upload or model write.
+    """
+    sections = set(sections)
+    params = {
+        "industry": industry,
+        "months": months,
+        "lang": lang,
+        "model": model,
+        "rules": rules_version(),
+        "from": start.isoformat() if start else None,
+        "to": end.isoformat() if end else None
+    }
+    if "benchmark" in sections and benchmark_mode == "percentile":
+        # Peer sketches move with other tenants' data, not this business's version
+        params["peers"] = get_registry(db, with_sketches=True).version
+    key = make_key(
+        ",".join(sorted(sections)),
+        params,
+        business_id,
+        get_data_version(db, business_id)
+    )
+    return result_cache.get_or_compute(
+        key,
+        lambda: _assess(db, business_id, sections, industry, months, lang, model, benchmark_mode, start, end),
+        # Translations that fell back to English are retried next time rather than cached
+        cacheable=lambda: not llm_degraded()
+    )
+
+
+def _assess(db, business_id, sections, industry, months, lang, model, benchmark_mode, start, end):
+    loans = gst = benchmark = peers = None
+
+    with span("db.rollup"):
+        monthly = load_monthly(db, business_id, start, end)
+
+    if sections & {"credit", "benchmark", "products"}:
+        with span("db.loans"):
+            loans = load_loans(db, business_id)
+
+    if sections & {"gst", "products"}:
+        with span("db.gst"):
+            gst = load_gst_returns(db, business_id, start, end)
+
+    if "benchmark" in sections:
+        with span("db.benchmark_registry"):
+            registry = get_registry(db, with_sketches=benchmark_mode == "percentile")
+        benchmark = registry.benchmarks.get(industry)
+        if benchmark_mode == "percentile":
+            peers = industry_sketches(registry, industry)
+
+    return run_assessment(
+        monthly,
+        loans_df=loans,
+        gst_df=gst,
+        sections=sections,
+        benchmark=benchmark,
+        industry=industry,
+        months_ahead=months,
+        lang=lang,
+        forecast_model=model,
+        peer_sketches=peers
+    )
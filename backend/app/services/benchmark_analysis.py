@@ -1,15 +1,23 @@
-def compare_with_benchmark(kpis, benchmark):
+def compare_with_benchmark(kpis, benchmark, percentiles=None):
     insights = []
+    percentiles = percentiles or {}
+
+    def compare(name, key, value, benchmark_value):
+        if value is None or benchmark_value is None:
+            return f"{name} is not available for comparison"
 
-    def compare(name, value, benchmark_value):
         if value >= benchmark_value:
-            return f"{name} is above industry average"
+            insight = f"{name} is above industry average"
         else:
-            return f"{name} is below industry average"
+            insight = f"{name} is below industry average"
+
+        if percentiles.get(key) is not None:
+            insight += f" (peer percentile {percentiles[key]:.0f})"
+        return insight
 
-    insights.append(compare("Gross Margin", kpis["gross_margin"], benchmark.avg_gross_margin))
-    insights.append(compare("Net Margin", kpis["net_margin"], benchmark.avg_net_margin))
-    insights.append(compare("Cash Flow Margin", kpis["cashflow_margin"], benchmark.avg_cashflow_margin))
-    insights.append(compare("DSCR", kpis["dscr"], benchmark.avg_dscr))
+    insights.append(compare("Gross Margin", "gross_margin", kpis["gross_margin"], benchmark.avg_gross_margin))
+    insights.append(compare("Net Margin", "net_margin", kpis["net_margin"], benchmark.avg_net_margin))
+    insights.append(compare("Cash Flow Margin", "cashflow_margin", kpis["cashflow_margin"], benchmark.avg_cashflow_margin))
+    insights.append(compare("DSCR", "dscr", kpis["dscr"], benchmark.avg_dscr))
 
-    return insights
\ No newline at end of file
+    return insights
@@ -0,0 +1,156 @@
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+
+from app.config import BENCHMARK_SKETCH_TTL
+from app.models.benchmark import IndustryBenchmark
+from app.models.business import Business
+from app.models.data_version import DataVersion
+from app.services.data_version import GLOBAL_SCOPE
+from app.services.portfolio import load_portfolio, portfolio_metrics
+
+# Same attribute names as the ORM row, so compare_with_benchmark accepts either
+BenchmarkRecord = namedtuple(
+    "BenchmarkRecord",
+    ["industry", "avg_gross_margin", "avg_net_margin", "avg_cashflow_margin", "avg_dscr"]
+)
+
+KPIS = ("gross_margin", "net_margin", "cashflow_margin", "dscr")
+SKETCH_POINTS = np.linspace(0, 100, 101)
+
+Snapshot = namedtuple("Snapshot", ["benchmarks", "source_version", "sketches", "sketched_at", "version"])
+
+_lock = threading.Lock()
+_snapshot = None
+
+
+def _global_version(db):
+    version = db.execute(
+        select(DataVersion.version).where(DataVersion.business_id == GLOBAL_SCOPE)
+    ).scalar()
+    return version or 0
+
+
+def _load_benchmarks(db):
+    rows = db.execute(select(
+        IndustryBenchmark.industry,
+        IndustryBenchmark.avg_gross_margin,
+        IndustryBenchmark.avg_net_margin,
+        IndustryBenchmark.avg_cashflow_margin,
+        IndustryBenchmark.avg_dscr
+    )).all()
+    return MappingProxyType({row.industry: BenchmarkRecord(*row) for row in rows})
+
+
+def population_kpis(db):
+    """calculate_business_kpis for every business with an industry, in one grouped pass."""
+    industries = pd.read_sql(
+        select(Business.id.label("business_id"), Business.industry)
+        .where(Business.industry.is_not(None)),
+        db.connection(),
+        index_col="business_id"
+    )
+    if industries.empty:
+        return pd.DataFrame(columns=["industry", *KPIS])
+
+    monthly, loans, _ = load_portfolio(db, industries.index.tolist())
+    if monthly.empty:
+        return pd.DataFrame(columns=["industry", *KPIS])
+
+    df = portfolio_metrics(monthly).join(loans, how="left")
+    revenue = df["revenue"].where(df["revenue"] != 0)
+    emi = df["total_monthly_emi"].fillna(0)
+
+    kpis = pd.DataFrame(index=df.index)
+    kpis["gross_margin"] = ((df["revenue"] - df["expenses"]) / revenue * 100).fillna(0)
+    kpis["net_margin"] = (df["net_cashflow"] / revenue * 100).fillna(0)
+    kpis["cashflow_margin"] = kpis["net_margin"]
+    kpis["dscr"] = (df["average_monthly_cashflow"] / emi).where(emi > 0)
+
+    return kpis.join(industries, how="inner")
+
+
+def build_sketches(kpis: pd.DataFrame):
+    """Per-industry, per-KPI quantile sketch: 101 sorted cut points from p0 to p100."""
+    sketches = {}
+    for industry, group in kpis.groupby("industry"):
+        sketches[industry] = MappingProxyType({
+            kpi: np.percentile(values, SKETCH_POINTS)
+            for kpi in KPIS
+            if len(values := group[kpi].dropna().to_numpy(dtype="float64"))
+        })
+    return MappingProxyType(sketches)
+
+
+def percentile_rank(value, sketch):
+    """Percent of peers at or below `value`, by binary search over the sketch."""
+    if value is None or sketch is None:
+        return None
+
+    position = np.searchsorted(sketch, value, side="right")
+    if position == 0:
+        return 0.0
+    if position >= len(sketch):
+        return 100.0
+
+    lo, hi = sketch[position - 1], sketch[position]
+    fraction = (value - lo) / (hi - lo) if hi > lo else 1.0
+    return round(float(SKETCH_POINTS[position - 1] + fraction * (SKETCH_POINTS[position] - SKETCH_POINTS[position - 1])), 1)
+
+
+def _freshness(snapshot, current, with_sketches: bool):
+    fresh_benchmarks = snapshot is not None and snapshot.source_version == current
+    fresh_sketches = not with_sketches or (
+        snapshot is not None
+        and snapshot.sketches is not None
+        and time.time() - snapshot.sketched_at < BENCHMARK_SKETCH_TTL
+    )
+    return fresh_benchmarks, fresh_sketches
+
+
+def get_registry(db, with_sketches: bool = False):
+    """Return the current immutable snapshot, reloading only what is stale.
+
+    Benchmarks reload when the shared data version moves (any
+    IndustryBenchmark write bumps it); peer sketches rebuild at most every
+    BENCHMARK_SKETCH_TTL seconds.
+    """
+    global _snapshot
+
+    current = _global_version(db)
+    if all(_freshness(_snapshot, current, with_sketches)):
+        return _snapshot
+
+    with _lock:
+        # Checked again: a thread that held the lock may already have rebuilt what we found stale
+        snapshot = _snapshot
+        fresh_benchmarks, fresh_sketches = _freshness(snapshot, current, with_sketches)
+        if fresh_benchmarks and fresh_sketches:
+            return snapshot
+
+        benchmarks = snapshot.benchmarks if fresh_benchmarks else _load_benchmarks(db)
+        sketches, sketched_at = (snapshot.sketches, snapshot.sketched_at) if snapshot else (None, 0)
+        if not fresh_sketches:
+            sketches, sketched_at = build_sketches(population_kpis(db)), time.time()
+
+        _snapshot = Snapshot(
+            benchmarks=benchmarks,
+            source_version=current,
+            sketches=sketches,
+            sketched_at=sketched_at,
+            version=(snapshot.version + 1) if snapshot else 1
+        )
+        return _snapshot
+
+
+def industry_sketches(snapshot, industry: str):
+    return (snapshot.sketches or {}).get(industry, MappingProxyType({}))
+
+
+def peer_percentiles(sketches, kpis: dict):
+    return {kpi: percentile_rank(kpis.get(kpi), sketches.get(kpi)) for kpi in KPIS}
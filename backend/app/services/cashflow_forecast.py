@@ -1,39 +1,26 @@
+import numpy as np
 import pandas as pd
+from app.services.forecast_engine import build_matrix, fit, forecast_arrays, forecast_response, runway_from_arrays
+from app.services.monthly_rollup import summarize_monthly
 
-def forecast_cashflow(df: pd.DataFrame, months_ahead=6):
-    # Group by month
-    monthly_cf = df.groupby(
-        df["date"].dt.to_period("M")
-    )["amount"].sum().sort_index()
+def forecast_cashflow(df: pd.DataFrame, months_ahead=6, model="sma"):
+    return forecast_cashflow_from_monthly(summarize_monthly(df), months_ahead=months_ahead, model=model)
 
-    if len(monthly_cf) < 2:
+
+def forecast_cashflow_from_monthly(monthly: pd.DataFrame, months_ahead=6, model="sma"):
+    if len(monthly) < 2:
         return {
             "error": "Not enough data to forecast"
         }
 
-    # Simple moving average (last 3 months)
-    rolling_avg = monthly_cf.tail(3).mean()
-
-    last_month = monthly_cf.index[-1]
-    forecast = {}
-
-    current_balance = df["amount"].sum()
-    balance = current_balance
-
-    for i in range(1, months_ahead + 1):
-        forecast_month = (last_month + i).strftime("%Y-%m")
-        balance += rolling_avg
-
-        forecast[forecast_month] = {
-            "expected_cashflow": round(rolling_avg, 2),
-            "expected_balance": round(balance, 2)
-        }
+    # A one-row run of the portfolio forecasting engine
+    business_ids, months, values, observed = build_matrix(
+        monthly.reset_index().assign(business_id=0)
+    )
+    state = fit(values, observed, months, business_ids)
+    arrays = forecast_arrays(state, months_ahead=months_ahead, method=model)
 
-    return {
-        "current_cash_balance": round(current_balance, 2),
-        "average_monthly_cashflow": round(rolling_avg, 2),
-        "forecast": forecast
-    }
+    return forecast_response(arrays, 0, months[-1], months_ahead, method=model)
 
 def runway_analysis(forecast_data):
     warnings = []
@@ -41,11 +28,11 @@ def runway_analysis(forecast_data):
     avg_cf = forecast_data.get("average_monthly_cashflow")
     balance = forecast_data.get("current_cash_balance")
 
-    if avg_cf < 0:
-        runway_months = abs(balance / avg_cf)
+    runway, negative = runway_from_arrays([balance], [avg_cf])
+    runway_months = None if np.isnan(runway[0]) else float(runway[0])
+
+    if negative[0]:
         warnings.append("Business is cash negative")
-    else:
-        runway_months = None
 
     if runway_months and runway_months < 3:
         warnings.append("CRITICAL: Less than 3 months runway")
@@ -54,4 +41,3 @@ def runway_analysis(forecast_data):
         "runway_months": round(runway_months, 1) if runway_months else None,
         "warnings": warnings
     }
-
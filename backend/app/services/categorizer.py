@@ -0,0 +1,161 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+
+import pandas as pd
+from sqlalchemy import select, update, bindparam, func, or_, and_
+
+from app.config import CATEGORY_RULES_PATH
+from app.models.financial import Transaction
+from app.services.data_version import bump_data_version
+
+_lock = threading.Lock()
+_state = {"mtime": None, "matcher": None}
+
+
+class CategoryMatcher:
+    """Every dictionary keyword compiled into one case-insensitive alternation.
+
+    A description is matched once against the whole dictionary; the
+    leftmost keyword found decides its category.
+    """
+
+    def __init__(self, rules: dict, version: str = None):
+        # Hash of the dictionary file this was built from, recorded on rows it categorizes
+        self.version = version
+        self.default = rules.get("default", "Uncategorized")
+        self.keywords = {}
+        for category, keywords in rules["categories"].items():
+            if not isinstance(keywords, list) or not all(isinstance(k, str) and k.strip() for k in keywords):
+                raise ValueError(f"Keywords for {category!r} must be a list of non-empty strings")
+            for keyword in keywords:
+                self.keywords.setdefault(" ".join(keyword.lower().split()), category)
+
+        # Longest first, so "gst payment" wins over "gst" where both start at the same spot
+        alternation = "|".join(
+            re.escape(k).replace(r"\ ", r"\s+") for k in sorted(self.keywords, key=len, reverse=True)
+        )
+        self.pattern = re.compile(rf"\b({alternation})\b", re.IGNORECASE) if alternation else None
+
+    def categorize(self, descriptions: pd.Series):
+        if self.pattern is None or descriptions.empty:
+            return pd.Series(self.default, index=descriptions.index, dtype="object")
+
+        matched = descriptions.astype("object").fillna("").str.extract(self.pattern, expand=False)
+        keyword = matched.str.lower().str.replace(r"\s+", " ", regex=True)
+        return keyword.map(self.keywords).fillna(self.default).astype("object")
+
+
+def get_category_matcher():
+    """The compiled dictionary, rebuilt whenever CATEGORY_RULES_PATH changes on disk.
+
+    As with the scoring rules, a bad edit is logged and the last good
+    dictionary stays in force. The matcher carries its own `version`, so
+    callers never pair it with the version of a later reload.
+    """
+    try:
+        mtime = os.stat(CATEGORY_RULES_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    if mtime == _state["mtime"] and _state["matcher"] is not None:
+        return _state["matcher"]
+
+    with _lock:
+        if mtime != _state["mtime"] or _state["matcher"] is None:
+            try:
+                with open(CATEGORY_RULES_PATH, "rb") as f:
+                    raw = f.read()
+                matcher = CategoryMatcher(json.loads(raw), hashlib.sha256(raw).hexdigest()[:16])
+            except Exception as e:
+                if _state["matcher"] is None:
+                    raise
+                logging.error(f"Ignoring invalid category rules in {CATEGORY_RULES_PATH}: {e}")
+            else:
+                _state["matcher"] = matcher
+            _state["mtime"] = mtime
+
+    return _state["matcher"]
+
+
+def category_rules_version():
+    return get_category_matcher().version
+
+
+def categorize_chunk(chunk: pd.DataFrame):
+    """Fill in categories the upload left blank (or "Uncategorized") from the dictionary.
+
+    Returns the category column and, per row, the dictionary version that
+    assigned it (None where the upload supplied its own category).
+    """
+    matcher = get_category_matcher()
+    category = chunk["category"].astype("object")
+    auto = (category.isna() | category.eq(matcher.default) | category.eq("")).to_numpy()
+
+    category = category.copy()
+    category[auto] = matcher.categorize(chunk["description"][auto])
+    source = pd.Series(None, index=chunk.index, dtype="object")
+    source[auto] = matcher.version
+    return category, source
+
+
+def recategorize(db, business_id: int = None, batch: int = 50_000, on_batch=None):
+    """Re-apply the current dictionary to stored rows it did not assign.
+
+    Covers rows categorized by an older dictionary plus rows stored as
+    "Uncategorized" before categorization existed; categories supplied in
+    an upload are never touched. Works in id-ordered batches, each its own
+    transaction, so an interrupted run simply resumes where it stopped.
+    """
+    matcher = get_category_matcher()
+    version = matcher.version
+    table = Transaction.__table__
+
+    stale = or_(
+        table.c.category_rules != version,
+        and_(
+            table.c.category_rules.is_(None),
+            or_(table.c.category.is_(None), table.c.category == matcher.default)
+        )
+    )
+    if business_id is not None:
+        stale = and_(stale, table.c.business_id == business_id)
+
+    total = db.execute(select(func.count()).select_from(table).where(stale)).scalar()
+    scanned = changed = 0
+    last_id = 0
+
+    while True:
+        rows = db.execute(
+            select(table.c.id, table.c.description, table.c.category, table.c.business_id)
+            .where(stale, table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(batch)
+        ).all()
+        if not rows:
+            break
+
+        frame = pd.DataFrame(rows, columns=["id", "description", "category", "business_id"])
+        categories = matcher.categorize(frame["description"])
+        is_changed = (categories != frame["category"]).to_numpy()
+
+        db.connection().execute(
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(category=bindparam("b_category"), category_rules=version),
+            [{"b_id": i, "b_category": c} for i, c in zip(frame["id"].tolist(), categories.tolist())]
+        )
+        for touched_id in frame["business_id"][is_changed].unique().tolist():
+            bump_data_version(db, touched_id)
+        db.commit()
+
+        scanned += len(frame)
+        changed += int(is_changed.sum())
+        last_id = int(frame["id"].iloc[-1])
+        if on_batch is not None:
+            on_batch(scanned, total)
+
+    return {"rows_scanned": scanned, "rows_changed": changed, "rules_version": version}
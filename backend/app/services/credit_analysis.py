@@ -1,10 +1,14 @@
 import pandas as pd
+from app.services.monthly_rollup import summarize_monthly
+from app.services.rules import get_rules, lending_readiness, credit_blocker_flags
 
 def calculate_credit_metrics(transactions_df: pd.DataFrame, loans_df: pd.DataFrame):
+    return calculate_credit_metrics_from_monthly(summarize_monthly(transactions_df), loans_df)
+
+
+def calculate_credit_metrics_from_monthly(monthly: pd.DataFrame, loans_df: pd.DataFrame):
     # Monthly operating cash flow
-    monthly_cf = transactions_df.groupby(
-        transactions_df["date"].dt.to_period("M")
-    )["amount"].sum()
+    monthly_cf = monthly["net"]
 
     avg_monthly_cashflow = monthly_cf.mean()
 
@@ -17,26 +21,20 @@ def calculate_credit_metrics(transactions_df: pd.DataFrame, loans_df: pd.DataFra
         else None
     )
 
-    lending_readiness = "LOW"
-    blockers = []
-
-    if dscr is not None:
-        if dscr >= 1.5:
-            lending_readiness = "HIGH"
-        elif dscr >= 1.2:
-            lending_readiness = "MEDIUM"
-        else:
-            blockers.append("Low DSCR (insufficient cash to service debt)")
-    else:
-        blockers.append("No existing debt data")
+    frame = pd.DataFrame([{
+        "dscr": dscr,
+        "average_monthly_cashflow": avg_monthly_cashflow
+    }])
+    rules = get_rules()
+    frame["lending_readiness"] = lending_readiness(frame, rules)
 
-    if avg_monthly_cashflow <= 0:
-        blockers.append("Negative operating cash flow")
+    blocker_flags = credit_blocker_flags(frame, rules).iloc[0]
+    blockers = [message for message, hit in blocker_flags.items() if hit]
 
     return {
         "average_monthly_cashflow": round(avg_monthly_cashflow, 2),
         "total_monthly_emi": round(total_monthly_emi, 2),
         "dscr": round(dscr, 2) if dscr else None,
-        "lending_readiness": lending_readiness,
+        "lending_readiness": str(frame["lending_readiness"].iloc[0]),
         "blockers": blockers
     }
\ No newline at end of file
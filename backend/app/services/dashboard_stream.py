@@ -0,0 +1,156 @@
+import asyncio
+import json
+import logging
+
+from fastapi.encoders import jsonable_encoder
+
+from app.concurrency import run_compute
+from app.config import STREAM_KEEPALIVE_SECONDS
+from app.database import SessionLocal
+from app.services.assessment import load_and_assess
+from app.services.data_version import get_data_version
+
+STREAM_SECTIONS = ("health", "forecast", "credit")
+
+
+def _snapshot(business_id: int):
+    db = SessionLocal()
+    try:
+        version = get_data_version(db, business_id)
+        sections = load_and_assess(db, business_id, STREAM_SECTIONS)
+    finally:
+        db.close()
+    return version, {"business_id": business_id, "data_version": version, **sections}
+
+
+def _format_event(version: int, payload: dict):
+    data = json.dumps(jsonable_encoder(payload), separators=(",", ":"))
+    return f"event: dashboard\nid: {version}\ndata: {data}\n\n"
+
+
+# No id, so a reconnecting client still resumes from the last state it actually got
+ERROR_EVENT = 'event: error\ndata: {"error":"Dashboard could not be computed"}\n\n'
+
+
+class DashboardBroadcaster:
+    """Fans one recompute per data change out to every open stream of a business.
+
+    Lives on the event loop; upload jobs call publish() from their worker
+    thread once their rows are committed. Only businesses with a connected
+    client are recomputed, and only when told their data changed, so idle
+    streams cost nothing but a keepalive. Per process: uploads handled by
+    another worker process are not seen.
+    """
+
+    def __init__(self):
+        self.loop = None
+        self._subscribers = {}  # business_id -> set of asyncio.Queue
+        self._latest = {}       # business_id -> (data version, formatted event)
+        self._refreshing = {}   # business_id -> in-flight refresh task
+        self._stale = set()     # changed again while a refresh was running
+
+    def subscribe(self, business_id: int):
+        self.loop = asyncio.get_running_loop()
+        # Holds at most the newest event: a slow client skips states, never falls behind
+        queue = asyncio.Queue(maxsize=1)
+        self._subscribers.setdefault(business_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, business_id: int, queue):
+        subscribers = self._subscribers.get(business_id)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[business_id]
+            self._latest.pop(business_id, None)
+
+    def publish(self, business_id: int):
+        """Thread-safe notice that a business's data changed."""
+        loop = self.loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._changed, business_id)
+
+    def _changed(self, business_id: int):
+        if business_id not in self._subscribers:
+            return
+        if business_id in self._refreshing:
+            self._stale.add(business_id)
+            return
+        self._start_refresh(business_id)
+
+    def _start_refresh(self, business_id: int):
+        task = asyncio.ensure_future(self._refresh(business_id))
+        self._refreshing[business_id] = task
+        return task
+
+    async def _refresh(self, business_id: int):
+        try:
+            while True:
+                self._stale.discard(business_id)
+                try:
+                    version, payload = await run_compute(_snapshot, business_id)
+                except Exception:
+                    logging.exception(f"Dashboard refresh for business {business_id} failed")
+                    # Not kept as the latest state: the next connect or upload tries again
+                    failed = (None, ERROR_EVENT)
+                    for queue in self._subscribers.get(business_id, ()):
+                        _offer(queue, failed)
+                    return failed
+
+                latest = self._latest.get(business_id)
+                if business_id in self._subscribers and (latest is None or latest[0] != version):
+                    latest = self._latest[business_id] = (version, _format_event(version, payload))
+                    for queue in self._subscribers[business_id]:
+                        _offer(queue, latest)
+
+                if business_id not in self._stale:
+                    return latest
+        finally:
+            del self._refreshing[business_id]
+
+    async def current(self, business_id: int):
+        """The latest event, computing it (once, however many clients ask) if there is none yet.
+
+        A failed computation comes back as (None, ERROR_EVENT).
+        """
+        latest = self._latest.get(business_id)
+        if latest is not None:
+            return latest
+        task = self._refreshing.get(business_id) or self._start_refresh(business_id)
+        return await asyncio.shield(task)
+
+
+def _offer(queue, item):
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(item)
+
+
+broadcaster = DashboardBroadcaster()
+
+
+async def dashboard_events(business_id: int, last_event_id: str = None):
+    """SSE body: the current state (unless the client already has it), then one event per change."""
+    queue = broadcaster.subscribe(business_id)
+    try:
+        sent = None
+        latest = await broadcaster.current(business_id)
+        if latest is not None:
+            if str(latest[0]) != last_event_id:
+                yield latest[1]
+            sent = latest
+
+        while True:
+            try:
+                item = await asyncio.wait_for(queue.get(), STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            # What was sent on connect may also have been queued while it was computed
+            if item is not sent:
+                yield item[1]
+                sent = item
+    finally:
+        broadcaster.unsubscribe(business_id, queue)
@@ -0,0 +1,138 @@
+import io
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+
+from app.instrumentation import record_rows
+from app.models.financial import Transaction
+from app.models.gst import GSTReturn
+from app.models.loan import Loan
+from app.services.ledger import CompactLedger
+
+TRANSACTION_DTYPES = {
+    "id": "int64",
+    "date": "datetime64[ns]",
+    "description": "object",
+    "amount": "float64",
+    "category": "object",
+    "category_rules": "object",
+    "business_id": "int64",
+    "fingerprint": "object",
+}
+
+LOAN_DTYPES = {
+    "id": "int64",
+    "lender": "object",
+    "monthly_emi": "float64",
+    "outstanding_amount": "float64",
+    "business_id": "int64",
+}
+
+GST_DTYPES = {
+    "id": "int64",
+    "period": "object",
+    "output_gst": "float64",
+    "input_gst": "float64",
+    "filed": "int64",
+    "business_id": "int64",
+}
+
+
+def _typed_column(values, dtype: str):
+    if dtype.startswith("datetime64"):
+        return pd.to_datetime(list(values)).astype(dtype)
+    if dtype == "object":
+        return np.asarray(values, dtype=object)
+
+    # NULLs arrive as None; keep them as NaN rather than failing the int cast
+    column = np.asarray(values, dtype="float64")
+    if dtype != "float64" and not np.isnan(column).any():
+        column = column.astype(dtype)
+    return column
+
+
+def _copy_out(db, stmt, names, dtypes):
+    conn = db.connection()
+    sql = str(stmt.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+
+    buffer = io.StringIO()
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY ({sql}) TO STDOUT WITH CSV", buffer)
+    finally:
+        cursor.close()
+    buffer.seek(0)
+
+    date_columns = [n for n in names if dtypes[n].startswith("datetime64")]
+    return pd.read_csv(
+        buffer,
+        names=names,
+        header=None,
+        dtype={n: dtypes[n] for n in names if n not in date_columns and dtypes[n] != "int64"},
+        parse_dates=date_columns,
+    )
+
+
+def read_columns(db, stmt, names, dtypes: dict):
+    """Execute a column-pruned select straight into typed columns.
+
+    On psycopg2 the rows are streamed with COPY ... TO STDOUT and parsed by
+    the pandas C reader, so no per-row Python objects are built. Other
+    drivers fall back to one fetchall transposed into NumPy columns.
+    """
+    conn = db.connection()
+    if conn.dialect.driver == "psycopg2":
+        df = _copy_out(db, stmt, names, dtypes)
+        record_rows(len(df))
+        return df
+
+    rows = conn.execute(stmt).fetchall()
+    record_rows(len(rows))
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return pd.DataFrame({
+        name: _typed_column(values, dtypes[name])
+        for name, values in zip(names, columns)
+    })
+
+
+def load_transactions(db, business_id: int, start=None, end=None, columns=("date", "amount")):
+    stmt = select(*[getattr(Transaction, c) for c in columns])\
+        .where(Transaction.business_id == business_id)
+
+    if start is not None:
+        stmt = stmt.where(Transaction.date >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.date <= end)
+
+    return read_columns(db, stmt, list(columns), TRANSACTION_DTYPES)
+
+
+def load_ledger(db, business_id: int, start=None, end=None):
+    """load_transactions narrowed to a CompactLedger for ledger-wide NumPy kernels."""
+    return CompactLedger.from_frame(load_transactions(db, business_id, start, end))
+
+
+def load_loans(db, business_id: int, columns=("monthly_emi",)):
+    stmt = select(*[getattr(Loan, c) for c in columns])\
+        .where(Loan.business_id == business_id)
+    return read_columns(db, stmt, list(columns), LOAN_DTYPES)
+
+
+def load_gst_returns(
+    db,
+    business_id: int,
+    start=None,
+    end=None,
+    columns=("period", "output_gst", "input_gst", "filed")
+):
+    stmt = select(*[getattr(GSTReturn, c) for c in columns])\
+        .where(GSTReturn.business_id == business_id)\
+        .order_by(GSTReturn.period)
+
+    # Periods are 'YYYY-MM' strings, so a return belongs to the window if its month does
+    if start is not None:
+        stmt = stmt.where(GSTReturn.period >= start.strftime("%Y-%m"))
+    if end is not None:
+        stmt = stmt.where(GSTReturn.period <= end.strftime("%Y-%m"))
+    return read_columns(db, stmt, list(columns), GST_DTYPES)
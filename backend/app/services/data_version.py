@@ -0,0 +1,82 @@
+from itertools import chain
+
+from sqlalchemy import event, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.models.benchmark import IndustryBenchmark
+from app.models.data_version import DataVersion
+from app.models.financial import Transaction
+from app.models.gst import GSTReturn
+from app.models.loan import Loan
+from app.models.rollup import MonthlyRollup
+
+GLOBAL_SCOPE = 0
+BUSINESS_MODELS = (Transaction, Loan, GSTReturn)
+GLOBAL_MODELS = (IndustryBenchmark,)
+
+
+def get_data_version(db, business_id: int):
+    # Both counters only ever increase, so their sum changes on every write
+    # to either the business's own data or the shared benchmark data.
+    version = db.execute(
+        select(func.coalesce(func.sum(DataVersion.version), 0))
+        .where(DataVersion.business_id.in_([GLOBAL_SCOPE, business_id]))
+    ).scalar()
+    return int(version)
+
+
+def data_fingerprint(db, business_id: int):
+    """Everything a business's results are built from, read in one round-trip.
+
+    Row count and max id of its loans and GST returns and of the shared
+    benchmarks, its transaction count, plus the data version. Transactions
+    are counted through their monthly rollup, which ingest updates in the
+    same transaction and which the analyses read, so this costs one row per
+    month rather than a scan of the ledger. Counts and ids catch inserts and
+    deletes that bypass the version counters; the version catches updates.
+    """
+    parts = [
+        select(func.coalesce(func.sum(MonthlyRollup.row_count), 0))
+        .where(MonthlyRollup.business_id == business_id)
+        .scalar_subquery()
+    ]
+    for model in (Loan, GSTReturn):
+        scoped = model.business_id == business_id
+        parts.append(select(func.count(model.id)).where(scoped).scalar_subquery())
+        parts.append(select(func.max(model.id)).where(scoped).scalar_subquery())
+    for model in GLOBAL_MODELS:
+        parts.append(select(func.count(model.id)).scalar_subquery())
+        parts.append(select(func.max(model.id)).scalar_subquery())
+    parts.append(
+        select(func.coalesce(func.sum(DataVersion.version), 0))
+        .where(DataVersion.business_id.in_([GLOBAL_SCOPE, business_id]))
+        .scalar_subquery()
+    )
+    return tuple(db.execute(select(*parts)).one())
+
+
+def bump_data_version(db, business_id: int = GLOBAL_SCOPE):
+    conn = db.connection()
+    table = DataVersion.__table__
+
+    result = conn.execute(
+        update(table)
+        .where(table.c.business_id == business_id)
+        .values(version=table.c.version + 1)
+    )
+    if result.rowcount == 0:
+        conn.execute(insert(table).values(business_id=business_id, version=1))
+
+
+@event.listens_for(Session, "after_flush")
+def _bump_on_model_writes(session, flush_context):
+    scopes = set()
+
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, BUSINESS_MODELS) and obj.business_id is not None:
+            scopes.add(obj.business_id)
+        elif isinstance(obj, GLOBAL_MODELS):
+            scopes.add(GLOBAL_SCOPE)
+
+    for scope in scopes:
+        bump_data_version(session, scope)
@@ -1,20 +1,22 @@
 import pandas as pd
+from app.services.monthly_rollup import summarize_monthly
+from app.services.rules import health_scores
 
 def compute_financial_metrics(df: pd.DataFrame):
-    # Ensure date column is datetime type
-    if 'date' in df.columns:
-        df['date'] = pd.to_datetime(df['date'])
-    
-    revenue = df[df["amount"] > 0]["amount"].sum()
-    expenses = abs(df[df["amount"] < 0]["amount"].sum())
+    return compute_financial_metrics_from_monthly(summarize_monthly(df))
+
+
+def compute_financial_metrics_from_monthly(monthly: pd.DataFrame):
+    revenue = monthly["inflow"].sum()
+    expenses = monthly["outflow"].sum()
     net_profit = revenue - expenses
     profit_margin = (net_profit / revenue) if revenue > 0 else 0
 
-    monthly_cashflow = df.groupby(df["date"].dt.to_period("M"))["amount"].sum()
+    monthly_cashflow = monthly["net"]
     negative_months = monthly_cashflow[monthly_cashflow < 0]
     avg_monthly_burn = abs(negative_months.mean()) if len(negative_months) > 0 else 0
 
-    cash_balance = df["amount"].sum()
+    cash_balance = monthly_cashflow.sum()
     runway_months = (cash_balance / avg_monthly_burn) if avg_monthly_burn > 0 else None
 
     return {
@@ -30,25 +32,5 @@ def compute_financial_metrics(df: pd.DataFrame):
 
 
 def financial_health_score(metrics: dict):
-    score = 0
-
-    if metrics["profit_margin"] > 20:
-        score += 30
-    elif metrics["profit_margin"] > 10:
-        score += 20
-    else:
-        score += 10
-
-    if metrics["runway_months"] and metrics["runway_months"] > 6:
-        score += 30
-    elif metrics["runway_months"]:
-        score += 20
-    else:
-        score += 10
-
-    if metrics["cash_balance"] > 0:
-        score += 20
-
-    score += 20  # baseline stability
-
-    return min(score, 100)
\ No newline at end of file
+    # Points and thresholds live in the rule table (see services/rules.py)
+    return int(health_scores(pd.DataFrame([metrics]))[0])
@@ -0,0 +1,234 @@
+import numpy as np
+import pandas as pd
+
+from app.config import FORECAST_ALPHA, FORECAST_BETA
+
+METHODS = ("sma", "ses", "holt", "seasonal_naive")
+SMA_WINDOW = 3
+SEASON_LENGTH = 12
+
+
+def build_matrix(monthly: pd.DataFrame):
+    """Pivot a long (business_id, month, net) rollup into a business x month matrix.
+
+    Months before a business's first month are NaN; gaps inside its history
+    are 0 net cash flow, with `observed` marking months that had rows.
+    """
+    months = pd.PeriodIndex(monthly["month"], freq="M")
+    span = pd.period_range(months.min(), months.max(), freq="M")
+
+    wide = pd.DataFrame({
+        "business_id": monthly["business_id"].to_numpy(),
+        "month": months,
+        "net": monthly["net"].to_numpy()
+    }).pivot_table(index="business_id", columns="month", values="net", aggfunc="sum")
+    wide = wide.reindex(columns=span)
+
+    values = wide.to_numpy(dtype="float64")
+    observed = ~np.isnan(values)
+    started = np.cumsum(observed, axis=1) > 0
+    values = np.where(started & ~observed, 0.0, values)
+
+    return wide.index.to_numpy(), span, values, observed
+
+
+def empty_state(business_ids, last_month=None):
+    n = len(business_ids)
+    return {
+        "business_ids": np.asarray(business_ids),
+        "last_month": last_month,
+        "balance": np.zeros(n),
+        "n_obs": np.zeros(n, dtype=np.int64),
+        "n_months": np.zeros(n, dtype=np.int64),
+        "recent": np.full((n, SMA_WINDOW), np.nan),     # last observed nets, oldest first
+        "season": np.full((n, SEASON_LENGTH), np.nan),  # last 12 calendar months, oldest first
+        "ses_level": np.zeros(n),
+        "level": np.zeros(n),
+        "trend": np.zeros(n),
+    }
+
+
+def update(state, values, observed, month, alpha=FORECAST_ALPHA, beta=FORECAST_BETA):
+    """Fold one calendar month into every business's state; returns a new state.
+
+    `values` holds that month's net per business (NaN if the business has
+    not started yet), so a refit only needs the months since `last_month`.
+    """
+    state = {k: (v.copy() if isinstance(v, np.ndarray) else v) for k, v in state.items()}
+    values = np.asarray(values, dtype="float64")
+    observed = np.asarray(observed, dtype=bool)
+
+    active = ~np.isnan(values)
+    v = np.where(active, values, 0.0)
+
+    state["balance"] += v
+    state["n_obs"] += observed
+
+    rolled = np.roll(state["recent"], -1, axis=1)
+    rolled[:, -1] = v
+    state["recent"] = np.where(observed[:, None], rolled, state["recent"])
+
+    rolled = np.roll(state["season"], -1, axis=1)
+    rolled[:, -1] = v
+    state["season"] = np.where(active[:, None], rolled, state["season"])
+
+    first = active & (state["n_months"] == 0)
+    second = active & (state["n_months"] == 1)
+    later = active & (state["n_months"] >= 2)
+
+    ses_level = alpha * v + (1 - alpha) * state["ses_level"]
+    state["ses_level"] = np.select([first, active], [v, ses_level], default=state["ses_level"])
+
+    level = state["level"]
+    trend = state["trend"]
+    holt_level = alpha * v + (1 - alpha) * (level + trend)
+    holt_trend = beta * (holt_level - level) + (1 - beta) * trend
+    state["level"] = np.select([first | second, later], [v, holt_level], default=level)
+    state["trend"] = np.select([first, second, later], [0.0, v - level, holt_trend], default=trend)
+
+    state["n_months"] += active
+    state["last_month"] = month
+    return state
+
+
+def fit(values, observed, months, business_ids, state=None, **params):
+    """Run `update` over each month column; pass `state` to continue an earlier fit."""
+    state = state if state is not None else empty_state(business_ids)
+    for i, month in enumerate(months):
+        state = update(state, values[:, i], observed[:, i], month, **params)
+    return state
+
+
+def refit(monthly: pd.DataFrame, through_month, state=None):
+    """Fit (or extend) the state with every month of the long rollup up to `through_month`.
+
+    With an existing state only months after its `last_month` are folded in;
+    businesses the state has not seen yet are first fitted on the earlier
+    months and appended.
+    """
+    business_ids, months, values, observed = build_matrix(monthly)
+    in_range = months <= through_month
+
+    if state is None:
+        return fit(values[:, in_range], observed[:, in_range], months[in_range], business_ids)
+
+    new = ~np.isin(business_ids, state["business_ids"])
+    if new.any():
+        history = months <= state["last_month"]
+        new_state = fit(
+            values[new][:, history],
+            observed[new][:, history],
+            months[history],
+            business_ids[new]
+        )
+        state = concat_states(state, new_state)
+
+    rows = pd.Index(business_ids).get_indexer(state["business_ids"])
+    known = (rows >= 0)[:, None]
+    columns = in_range & (months > state["last_month"])
+
+    return fit(
+        np.where(known, values[rows][:, columns], np.nan),
+        np.where(known, observed[rows][:, columns], False),
+        months[columns],
+        state["business_ids"],
+        state=state
+    )
+
+
+def expected_cashflows(state, months_ahead: int, method: str = "sma"):
+    if method not in METHODS:
+        raise ValueError(f"Unknown forecast model: {method}")
+
+    n = len(state["business_ids"])
+    sma = np.nanmean(state["recent"], axis=1) if n else np.zeros(0)
+
+    if method == "sma":
+        return np.repeat(sma[:, None], months_ahead, axis=1)
+
+    if method == "ses":
+        return np.repeat(state["ses_level"][:, None], months_ahead, axis=1)
+
+    if method == "holt":
+        steps = np.arange(1, months_ahead + 1)
+        return state["level"][:, None] + state["trend"][:, None] * steps[None, :]
+
+    # seasonal naive: same calendar month one year earlier, SMA until a full year exists
+    idx = (np.arange(months_ahead)) % SEASON_LENGTH
+    seasonal = state["season"][:, idx]
+    has_year = state["n_months"] >= SEASON_LENGTH
+    return np.where(has_year[:, None], seasonal, sma[:, None])
+
+
+def runway_from_arrays(balance, avg_cashflow):
+    """Months until cash runs out at the average burn; NaN when cash flow is not negative."""
+    balance = np.asarray(balance, dtype="float64")
+    avg_cashflow = np.asarray(avg_cashflow, dtype="float64")
+    negative = avg_cashflow < 0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        runway = np.abs(balance / avg_cashflow)
+    return np.where(negative, runway, np.nan), negative
+
+
+def forecast_arrays(state, months_ahead: int = 6, method: str = "sma"):
+    expected = expected_cashflows(state, months_ahead, method)
+    balances = state["balance"][:, None] + np.cumsum(expected, axis=1)
+    average = expected.mean(axis=1) if months_ahead else np.full(len(expected), np.nan)
+    runway, negative = runway_from_arrays(state["balance"], average)
+
+    return {
+        "business_ids": state["business_ids"],
+        "enough_data": state["n_obs"] >= 2,
+        "current_balance": state["balance"],
+        "average_cashflow": average,
+        "expected": expected,
+        "balances": balances,
+        "runway_months": runway,
+        "cash_negative": negative,
+    }
+
+
+def forecast_response(arrays, i: int, start_month, months_ahead: int, method: str = "sma"):
+    """Shape row `i` of forecast_arrays like the single-business /cashflow-forecast payload."""
+    if not arrays["enough_data"][i]:
+        return {
+            "error": "Not enough data to forecast"
+        }
+
+    forecast = {}
+    for h in range(months_ahead):
+        forecast[(start_month + h + 1).strftime("%Y-%m")] = {
+            "expected_cashflow": round(float(arrays["expected"][i, h]), 2),
+            "expected_balance": round(float(arrays["balances"][i, h]), 2)
+        }
+
+    response = {
+        "current_cash_balance": round(float(arrays["current_balance"][i]), 2),
+        "average_monthly_cashflow": round(float(arrays["average_cashflow"][i]), 2),
+        "forecast": forecast
+    }
+    if method != "sma":
+        response["model"] = method
+    return response
+
+
+def save_state(state, path):
+    np.savez(
+        path,
+        last_month=np.array(state["last_month"].strftime("%Y-%m")),
+        **{k: v for k, v in state.items() if k != "last_month"}
+    )
+
+
+def load_state(path):
+    with np.load(path, allow_pickle=False) as data:
+        state = {k: data[k] for k in data.files}
+    state["last_month"] = pd.Period(str(state["last_month"]), freq="M")
+    return state
+
+
+def concat_states(a, b):
+    return {
+        k: (np.concatenate([a[k], b[k]]) if k != "last_month" else a[k])
+        for k in a
+    }
@@ -1,11 +1,11 @@
 import pandas as pd
 
 def analyze_gst_compliance(df: pd.DataFrame):
-    df["gst_payable"] = df["output_gst"] - df["input_gst"]
+    gst_payable = df["output_gst"] - df["input_gst"]
 
     total_output = df["output_gst"].sum()
     total_input = df["input_gst"].sum()
-    total_payable = df["gst_payable"].sum()
+    total_payable = gst_payable.sum()
 
     unfiled_periods = df[df["filed"] == 0]["period"].tolist()
 
@@ -30,4 +30,12 @@ def analyze_gst_compliance(df: pd.DataFrame):
         "unfiled_periods": unfiled_periods,
         "compliance_score": max(score, 0),
         "warnings": warnings
-    }
\ No newline at end of file
+    }
+
+
+def gst_filing_score(df: pd.DataFrame):
+    # Coarse filing score used for product eligibility
+    score = 100
+    if not df.empty and (df["filed"] == 0).any():
+        score -= 30
+    return score
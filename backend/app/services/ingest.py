@@ -0,0 +1,208 @@
+import hashlib
+import io
+import time
+from collections import Counter
+
+import pandas as pd
+from sqlalchemy import insert, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.config import UPLOAD_CHUNK_SIZE
+from app.instrumentation import record_rows, span
+from app.models.financial import Transaction
+from app.services.categorizer import categorize_chunk
+from app.services.data_version import bump_data_version
+from app.services.monthly_rollup import summarize_monthly, apply_monthly_rollup
+
+REQUIRED_COLUMNS = {"date", "description", "amount"}
+CSV_COLUMNS = REQUIRED_COLUMNS | {"category"}
+COPY_COLUMNS = ["date", "description", "amount", "category", "category_rules", "business_id", "fingerprint"]
+CONFLICT_COLUMNS = ["business_id", "fingerprint"]
+
+
+def coerce_chunk(chunk: pd.DataFrame, business_id: int):
+    missing = REQUIRED_COLUMNS - set(chunk.columns)
+    if missing:
+        raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+
+    out = pd.DataFrame({
+        "date": pd.to_datetime(chunk["date"], errors="coerce"),
+        "description": chunk["description"].fillna("").astype(str),
+        "amount": pd.to_numeric(chunk["amount"], errors="coerce").astype("float64"),
+    })
+
+    # Left blank here; categorize_chunk fills in whatever the statement didn't say
+    if "category" in chunk.columns:
+        out["category"] = chunk["category"].astype("object")
+    else:
+        out["category"] = None
+
+    out["business_id"] = business_id
+
+    valid = out["date"].notna() & out["amount"].notna()
+    return out[valid], int((~valid).sum())
+
+
+def fingerprint_chunk(chunk: pd.DataFrame, seen: Counter):
+    """Content fingerprint per row: business, date, amount and description.
+
+    Identical rows inside one upload (two equal purchases on the same day)
+    are told apart by their occurrence number, counted across chunks in
+    `seen`, so a statement's genuine repeats are all kept while uploading
+    the same statement again reproduces exactly the same fingerprints.
+    """
+    if chunk.empty:
+        return pd.Series([], index=chunk.index, dtype="object")
+
+    # Amounts as whole paise, so 1200, 1200.0 and 1200.00 agree
+    keys = (
+        chunk["business_id"].astype(str)
+        + "|" + chunk["date"].dt.strftime("%Y-%m-%d")
+        + "|" + (chunk["amount"] * 100).round().astype("int64").astype(str)
+        + "|" + chunk["description"].str.strip().str.replace(r"\s+", " ", regex=True)
+    )
+    occurrence = keys.groupby(keys, sort=False).cumcount().to_numpy()
+    if seen:
+        occurrence = occurrence + [seen[key] for key in keys]
+    seen.update(keys)
+
+    return pd.Series(
+        [
+            hashlib.blake2b(f"{key}|{n}".encode(), digest_size=16).hexdigest()
+            for key, n in zip(keys, occurrence.tolist())
+        ],
+        index=chunk.index,
+        dtype="object"
+    )
+
+
+def existing_fingerprints(conn, business_id: int, chunk: pd.DataFrame):
+    """Fingerprints already stored for the chunk's date range (one indexed range scan)."""
+    if chunk.empty:
+        return set()
+
+    table = Transaction.__table__
+    return set(conn.execute(
+        select(table.c.fingerprint).where(
+            table.c.business_id == business_id,
+            table.c.date.between(chunk["date"].min().date(), chunk["date"].max().date())
+        )
+    ).scalars())
+
+
+def _copy_chunk(conn, chunk: pd.DataFrame):
+    # COPY can't skip conflicts, so stage the chunk and move it across with ON CONFLICT
+    buffer = io.StringIO()
+    chunk[COPY_COLUMNS].to_csv(buffer, index=False, header=False, date_format="%Y-%m-%d")
+    buffer.seek(0)
+
+    columns = ", ".join(COPY_COLUMNS)
+    cursor = conn.connection.driver_connection.cursor()
+    try:
+        cursor.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS ingest_staging "
+            "(date date, description text, amount double precision, category text, "
+            "category_rules varchar(16), business_id integer, fingerprint varchar(32)) ON COMMIT DELETE ROWS"
+        )
+        cursor.execute("TRUNCATE ingest_staging")
+        cursor.copy_expert(f"COPY ingest_staging ({columns}) FROM STDIN WITH CSV", buffer)
+        cursor.execute(
+            f"INSERT INTO transactions ({columns}) SELECT {columns} FROM ingest_staging "
+            f"ON CONFLICT ({', '.join(CONFLICT_COLUMNS)}) DO NOTHING RETURNING fingerprint"
+        )
+        inserted = {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+    record_rows(len(chunk))
+    return inserted
+
+
+def _insert_chunk(conn, chunk: pd.DataFrame):
+    # Built from column lists: to_dict("records") boxes every Arrow-backed string one by one
+    columns = [chunk["date"].dt.date.tolist() if name == "date" else chunk[name].tolist() for name in COPY_COLUMNS]
+    records = [dict(zip(COPY_COLUMNS, row)) for row in zip(*columns)]
+    table = Transaction.__table__
+
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(conn.dialect.name)
+    if dialect is None:
+        # No portable ON CONFLICT; the unique index still rejects a racing duplicate
+        conn.execute(insert(table), records)
+        return set(chunk["fingerprint"])
+
+    stmt = dialect.insert(table).on_conflict_do_nothing(index_elements=CONFLICT_COLUMNS)
+    return set(conn.execute(stmt.returning(table.c.fingerprint), records).scalars())
+
+
+def write_chunk(conn, chunk: pd.DataFrame):
+    """Insert a fingerprinted chunk, skipping rows already stored; returns the rows inserted."""
+    if chunk.empty:
+        return chunk
+
+    if conn.dialect.driver == "psycopg2":
+        inserted = _copy_chunk(conn, chunk)
+    else:
+        inserted = _insert_chunk(conn, chunk)
+
+    if len(inserted) == len(chunk):
+        return chunk
+    return chunk[chunk["fingerprint"].isin(inserted)]
+
+
+def ingest_csv(source, db, business_id: int = 1, chunksize: int = UPLOAD_CHUNK_SIZE, on_chunk=None):
+    """Load a CSV statement, skipping rows that are already stored.
+
+    Only new rows reach the table and the monthly rollup, so re-uploading an
+    overlapping statement costs a fingerprint lookup per row and writes
+    nothing twice. `on_chunk(stats)` is called after every chunk.
+    """
+    started = time.perf_counter()
+    inserted = 0
+    skipped = 0
+    rejected = 0
+    seen = Counter()
+
+    conn = db.connection()
+    reader = pd.read_csv(
+        source,
+        chunksize=chunksize,
+        usecols=lambda c: c in CSV_COLUMNS,
+        dtype={"description": str, "category": str},
+    )
+
+    for raw in reader:
+        with span("ingest.parse"):
+            chunk, bad_rows = coerce_chunk(raw, business_id)
+            chunk = chunk.assign(fingerprint=fingerprint_chunk(chunk, seen))
+
+        with span("ingest.dedupe"):
+            known = existing_fingerprints(conn, business_id, chunk)
+            fresh = chunk[~chunk["fingerprint"].isin(known)] if known else chunk
+
+        with span("ingest.categorize"):
+            category, category_rules = categorize_chunk(fresh)
+            fresh = fresh.assign(category=category, category_rules=category_rules)
+
+        with span("ingest.write"):
+            written = write_chunk(conn, fresh)
+        with span("ingest.rollup"):
+            apply_monthly_rollup(db, business_id, summarize_monthly(written))
+
+        inserted += len(written)
+        skipped += len(chunk) - len(written)
+        rejected += bad_rows
+        if on_chunk is not None:
+            on_chunk({"rows_inserted": inserted, "rows_skipped": skipped, "rows_rejected": rejected})
+
+    if inserted:
+        bump_data_version(db, business_id)
+    db.commit()
+
+    elapsed = time.perf_counter() - started
+    processed = inserted + skipped
+    return {
+        "rows_inserted": inserted,
+        "rows_skipped": skipped,
+        "rows_rejected": rejected,
+        "elapsed_seconds": round(elapsed, 3),
+        "rows_per_second": round(processed / elapsed, 1) if elapsed > 0 else None
+    }
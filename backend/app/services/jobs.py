@@ -0,0 +1,103 @@
+import contextvars
+import logging
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from app.ai.resilience import RequestBudget, current_budget
+from app.config import LLM_JOB_BUDGET
+
+
+class Job:
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = "queued"
+        self.done = 0
+        self.total = None
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.future = None
+
+    def set_progress(self, done: int, total: int = None):
+        self.done = done
+        if total is not None:
+            self.total = total
+
+    def to_dict(self):
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "progress": {
+                "done": self.done,
+                "total": self.total,
+                "percent": round(100 * self.done / self.total, 1) if self.total else None
+            },
+            "error": self.error,
+            "created_at": self.created_at,
+            "finished_at": self.finished_at
+        }
+
+
+class JobQueue:
+    """In-process background jobs with status tracking.
+
+    `fn(job, *args)` runs on a bounded thread pool and may call
+    job.set_progress(); its return value becomes job.result. Finished jobs
+    are kept for `retention` seconds (and at most `max_jobs` in total).
+    """
+
+    def __init__(self, workers: int = 2, retention: float = 3600, max_jobs: int = 1000, name: str = "jobs"):
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=name)
+        self.retention = retention
+        self.max_jobs = max_jobs
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, fn, *args, **kwargs):
+        job = Job(kind)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        # Stages a job runs are still attributed to the request that queued it
+        context = contextvars.copy_context()
+        job.future = self.pool.submit(context.run, self._run, job, fn, args, kwargs)
+        return job
+
+    def _run(self, job, fn, args, kwargs):
+        job.status = "running"
+        # The queuing request's LLM budget may be spent by now; a job gets its own from when it starts
+        current_budget.set(RequestBudget(LLM_JOB_BUDGET))
+        try:
+            job.result = fn(job, *args, **kwargs)
+            job.status = "completed"
+        except Exception as e:
+            logging.exception(f"{job.kind} job {job.id} failed")
+            job.error = str(e)
+            job.status = "failed"
+        finally:
+            job.finished_at = time.time()
+        return job.result
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+        finished = sorted(
+            (job for job in self._jobs.values() if job.finished_at is not None),
+            key=lambda job: job.finished_at
+        )
+        while len(self._jobs) >= self.max_jobs and finished:
+            del self._jobs[finished.pop(0).id]
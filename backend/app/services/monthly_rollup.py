@@ -0,0 +1,168 @@
+import pandas as pd
+from sqlalchemy import select, delete, update, insert, bindparam, func, case, literal_column
+from sqlalchemy.dialects import postgresql, sqlite
+
+from app.instrumentation import record_rows
+from app.models.financial import Transaction
+from app.models.rollup import MonthlyRollup
+from app.services.ledger import CompactLedger
+from app.services.data_version import bump_data_version
+
+ROLLUP_COLUMNS = ["inflow", "outflow", "net", "row_count"]
+
+
+def empty_monthly():
+    return pd.DataFrame(
+        {c: pd.Series(dtype="float64") for c in ROLLUP_COLUMNS},
+        index=pd.PeriodIndex([], freq="M", name="month")
+    )
+
+
+def summarize_monthly(df):
+    """Collapse a (date, amount) ledger into per-month inflow/outflow/net/row_count.
+
+    Accepts a DataFrame or a CompactLedger; a DataFrame is only read, never modified.
+    """
+    ledger = df if isinstance(df, CompactLedger) else CompactLedger.from_frame(df)
+    if not len(ledger):
+        return empty_monthly()
+
+    ordinals, inflow, outflow, net, row_count = ledger.monthly()
+    return pd.DataFrame(
+        {"inflow": inflow, "outflow": outflow, "net": net, "row_count": row_count},
+        index=pd.PeriodIndex.from_ordinals(ordinals, freq="M", name="month")
+    )
+
+
+def _monthly_frame(rows):
+    if not rows:
+        return empty_monthly()
+
+    df = pd.DataFrame(rows, columns=["month"] + ROLLUP_COLUMNS)
+    df.index = pd.PeriodIndex(df.pop("month"), freq="M", name="month")
+    return df.sort_index()
+
+
+def load_monthly_rollup(db, business_id: int):
+    rows = db.execute(
+        select(
+            MonthlyRollup.month,
+            MonthlyRollup.inflow,
+            MonthlyRollup.outflow,
+            MonthlyRollup.net,
+            MonthlyRollup.row_count
+        ).where(MonthlyRollup.business_id == business_id)
+    ).all()
+    record_rows(len(rows))
+    return _monthly_frame(rows)
+
+
+def month_label(column, dialect_name: str):
+    """SQL expression for a date column's 'YYYY-MM' month, the format MonthlyRollup.month uses."""
+    # Inlined rather than bound, so SELECT and GROUP BY render the identical expression
+    if dialect_name == "postgresql":
+        return func.to_char(func.date_trunc(literal_column("'month'"), column), literal_column("'YYYY-MM'"))
+    if dialect_name == "sqlite":
+        return func.strftime(literal_column("'%Y-%m'"), column)
+    raise NotImplementedError(f"No month truncation for the {dialect_name} dialect")
+
+
+def aggregate_monthly(db, business_id: int, start=None, end=None):
+    """summarize_monthly done by the database: one GROUP BY row per month crosses the wire."""
+    amount = Transaction.amount
+    month = month_label(Transaction.date, db.connection().dialect.name).label("month")
+
+    stmt = select(
+        month,
+        func.sum(case((amount > 0, amount), else_=0)),
+        func.sum(case((amount < 0, -amount), else_=0)),
+        func.sum(amount),
+        func.count()
+    ).where(Transaction.business_id == business_id)
+
+    if start is not None:
+        stmt = stmt.where(Transaction.date >= start)
+    if end is not None:
+        stmt = stmt.where(Transaction.date <= end)
+
+    rows = db.execute(stmt.group_by(month)).all()
+    record_rows(len(rows))
+    return _monthly_frame(rows)
+
+
+def load_monthly(db, business_id: int, start=None, end=None):
+    """Monthly sums for a date window; the whole history comes straight from the rollup table."""
+    if start is None and end is None:
+        return load_monthly_rollup(db, business_id)
+    return aggregate_monthly(db, business_id, start, end)
+
+
+def apply_monthly_rollup(db, business_id: int, monthly: pd.DataFrame):
+    """Add a chunk's monthly sums onto the stored rollup (same transaction as the insert).
+
+    One upsert per month, so concurrent uploads for the same business that
+    both start a new month add up instead of colliding on the unique key.
+    """
+    if monthly.empty:
+        return
+
+    deltas = monthly.reset_index()
+    deltas["month"] = deltas["month"].astype(str)
+    records = deltas.assign(business_id=business_id).to_dict("records")
+
+    conn = db.connection()
+    table = MonthlyRollup.__table__
+    dialect = {"postgresql": postgresql, "sqlite": sqlite}.get(conn.dialect.name)
+    if dialect is None:
+        _apply_without_upsert(conn, business_id, records)
+        return
+
+    stmt = dialect.insert(table)
+    conn.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["business_id", "month"],
+            set_={c: table.c[c] + stmt.excluded[c] for c in ROLLUP_COLUMNS}
+        ),
+        records
+    )
+
+
+def _apply_without_upsert(conn, business_id: int, records):
+    # No portable ON CONFLICT; a concurrent first write to a month fails on the unique key instead
+    table = MonthlyRollup.__table__
+    existing = set(conn.execute(
+        select(table.c.month).where(
+            table.c.business_id == business_id,
+            table.c.month.in_([r["month"] for r in records])
+        )
+    ).scalars())
+
+    updates = [r for r in records if r["month"] in existing]
+    inserts = [r for r in records if r["month"] not in existing]
+
+    if updates:
+        conn.execute(
+            update(table)
+            .where(
+                table.c.business_id == bindparam("b_business_id"),
+                table.c.month == bindparam("b_month")
+            )
+            .values(
+                inflow=table.c.inflow + bindparam("b_inflow"),
+                outflow=table.c.outflow + bindparam("b_outflow"),
+                net=table.c.net + bindparam("b_net"),
+                row_count=table.c.row_count + bindparam("b_row_count")
+            ),
+            [{f"b_{k}": v for k, v in r.items()} for r in updates]
+        )
+
+    if inserts:
+        conn.execute(insert(table), inserts)
+
+
+def rebuild_monthly_rollup(db, business_id: int):
+    monthly = aggregate_monthly(db, business_id)
+
+    db.execute(delete(MonthlyRollup).where(MonthlyRollup.business_id == business_id))
+    apply_monthly_rollup(db, business_id, monthly)
+    bump_data_version(db, business_id)
@@ -0,0 +1,175 @@
+import time
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, func, case
+
+from app.instrumentation import record_rows
+from app.models.gst import GSTReturn
+from app.models.loan import Loan
+from app.models.rollup import MonthlyRollup
+from app.services.rules import get_rules, health_scores, lending_readiness, product_flags, product_catalogue
+
+def _scoped(stmt, column, business_ids):
+    return stmt.where(column.in_(business_ids)) if business_ids is not None else stmt
+
+
+def load_portfolio(db, business_ids=None):
+    """Read every tenant's monthly rollup, EMI total and GST summary in three grouped queries."""
+    conn = db.connection()
+
+    monthly = pd.read_sql(
+        _scoped(
+            select(
+                MonthlyRollup.business_id,
+                MonthlyRollup.month,
+                MonthlyRollup.inflow,
+                MonthlyRollup.outflow,
+                MonthlyRollup.net
+            ),
+            MonthlyRollup.business_id,
+            business_ids
+        ),
+        conn
+    )
+
+    loans = pd.read_sql(
+        _scoped(
+            select(
+                Loan.business_id,
+                func.sum(Loan.monthly_emi).label("total_monthly_emi")
+            ).group_by(Loan.business_id),
+            Loan.business_id,
+            business_ids
+        ),
+        conn,
+        index_col="business_id"
+    )
+
+    gst = pd.read_sql(
+        _scoped(
+            select(
+                GSTReturn.business_id,
+                func.sum(GSTReturn.output_gst).label("total_output_gst"),
+                func.sum(GSTReturn.input_gst).label("total_input_gst"),
+                func.sum(case((GSTReturn.filed == 0, 1), else_=0)).label("unfiled_count")
+            ).group_by(GSTReturn.business_id),
+            GSTReturn.business_id,
+            business_ids
+        ),
+        conn,
+        index_col="business_id"
+    )
+
+    record_rows(len(monthly) + len(loans) + len(gst))
+    return monthly, loans, gst
+
+
+def portfolio_metrics(monthly: pd.DataFrame):
+    """compute_financial_metrics for every business at once, from a long rollup frame."""
+    grouped = monthly.assign(
+        burn=monthly["net"].where(monthly["net"] < 0)
+    ).groupby("business_id")
+
+    out = pd.DataFrame({
+        "revenue": grouped["inflow"].sum(),
+        "expenses": grouped["outflow"].sum(),
+        "cash_balance": grouped["net"].sum(),
+        "average_monthly_cashflow": grouped["net"].mean(),
+        "avg_monthly_burn": grouped["burn"].mean().abs().fillna(0),
+        "months": grouped["net"].size(),
+    })
+
+    out["net_profit"] = out["revenue"] - out["expenses"]
+    out["net_cashflow"] = out["cash_balance"]
+
+    has_revenue = out["revenue"] > 0
+    out["profit_margin"] = np.where(
+        has_revenue, out["net_profit"] / out["revenue"].where(has_revenue) * 100, 0
+    )
+
+    has_burn = out["avg_monthly_burn"] > 0
+    out["runway_months"] = (out["cash_balance"] / out["avg_monthly_burn"]).where(has_burn)
+
+    return out
+
+
+def credit_columns(df: pd.DataFrame, rules):
+    emi = df["total_monthly_emi"]
+    dscr = (df["average_monthly_cashflow"] / emi).where(emi > 0)
+
+    readiness = lending_readiness(df.assign(dscr=dscr), rules)
+    return dscr.round(2).replace(0, np.nan), readiness
+
+
+def gst_compliance_scores(df: pd.DataFrame):
+    has_gst = df["unfiled_count"].notna()
+    score = (
+        100
+        - np.where(df["unfiled_count"] > 0, 30, 0)
+        - np.where(df["total_output_gst"] == 0, 20, 0)
+    )
+    filing_score = np.where(df["unfiled_count"] > 0, 70, 100)
+
+    return pd.Series(score, index=df.index).where(has_gst), filing_score
+
+
+def score_frames(monthly: pd.DataFrame, loans: pd.DataFrame, gst: pd.DataFrame):
+    df = portfolio_metrics(monthly)
+    df = df.join(loans, how="left").join(gst, how="left")
+    df["total_monthly_emi"] = df["total_monthly_emi"].fillna(0)
+
+    rules = get_rules()
+    df["financial_health_score"] = health_scores(df, rules)
+    df["dscr"], df["lending_readiness"] = credit_columns(df, rules)
+    df["gst_compliance_score"], df["gst_score"] = gst_compliance_scores(df)
+
+    flags = product_flags(df, rules)
+    # Comma-joined product names, built column-wise rather than per business
+    products = pd.Series("", index=df.index)
+    for key, name, _ in product_catalogue(rules):
+        products = products + np.where(flags[key], name + ",", "")
+    df["recommended_products"] = products.str.rstrip(",")
+
+    return df.reset_index()
+
+
+OUTPUT_COLUMNS = [
+    "business_id",
+    "financial_health_score",
+    "revenue",
+    "expenses",
+    "profit_margin",
+    "cash_balance",
+    "runway_months",
+    "average_monthly_cashflow",
+    "total_monthly_emi",
+    "dscr",
+    "lending_readiness",
+    "gst_compliance_score",
+    "recommended_products",
+]
+
+
+def score_portfolio(db, business_ids=None, load=None):
+    """Score every business; `load(business_ids)` replaces the database read (e.g. snapshots.load_portfolio)."""
+    started = time.perf_counter()
+    monthly, loans, gst = load(business_ids) if load is not None else load_portfolio(db, business_ids)
+
+    if monthly.empty:
+        scores = pd.DataFrame(columns=OUTPUT_COLUMNS)
+    else:
+        scores = score_frames(monthly, loans, gst)[OUTPUT_COLUMNS]
+
+    elapsed = time.perf_counter() - started
+    stats = {
+        "businesses": len(scores),
+        "elapsed_seconds": round(elapsed, 3),
+        "businesses_per_second": round(len(scores) / elapsed, 1) if elapsed > 0 else None
+    }
+    return scores, stats
+
+
+def iter_ndjson(scores: pd.DataFrame, batch_size: int = 5000):
+    for start in range(0, len(scores), batch_size):
+        yield scores.iloc[start:start + batch_size].to_json(orient="records", lines=True).rstrip("\n") + "\n"
@@ -1,21 +1,131 @@
-from fpdf import FPDF
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 
-def generate_pdf_report(summary: dict):
+from app.config import REPORT_FONT_PATH, REPORT_WORKERS
+from app.instrumentation import span
+
+REPORT_SECTIONS = ["health", "credit", "gst", "products", "forecast"]
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _text(value, unicode_font: bool):
+    # Core PDF fonts are latin-1 only; without a Unicode TTF, degrade instead of failing
+    text = str(value)
+    return text if unicode_font else text.encode("latin-1", "replace").decode("latin-1")
+
+
+def build_report_summary(assessment: dict):
+    """Flatten an assessment (see services/assessment.py) into report lines."""
+    summary = {}
+
+    health = assessment.get("health", {})
+    if "error" not in health:
+        metrics = health["metrics"]
+        summary["Financial Health Score"] = health["score"]
+        summary["Revenue"] = round(metrics["revenue"], 2)
+        summary["Expenses"] = round(metrics["expenses"], 2)
+        summary["Profit Margin (%)"] = round(metrics["profit_margin"], 2)
+        summary["Cash Balance"] = round(metrics["cash_balance"], 2)
+    else:
+        summary["Financial Health Score"] = health["error"]
+
+    credit = assessment.get("credit", {})
+    if "error" not in credit:
+        summary["DSCR"] = credit["dscr"] if credit["dscr"] is not None else "N/A"
+        summary["Lending Readiness"] = credit["lending_readiness"]
+
+    forecast = assessment.get("forecast", {})
+    if "error" not in forecast:
+        summary["Average Monthly Cash Flow"] = forecast["average_monthly_cashflow"]
+        summary["Runway (months)"] = forecast["runway_months"] or "N/A"
+
+    gst = assessment.get("gst", {})
+    if "error" not in gst:
+        score = gst["compliance_score"]
+        risk = "Low Risk" if score >= 90 else "Medium Risk" if score >= 70 else "High Risk"
+        summary["GST Compliance"] = f"{risk} ({score}/100)"
+        # Translated when the report is requested in another language
+        if gst["warnings"]:
+            summary["GST Warnings"] = list(gst["warnings"])
+    else:
+        summary["GST Compliance"] = gst["error"]
+
+    products = assessment.get("products", {}).get("recommended_products", [])
+    if products:
+        summary["Recommended Product"] = ", ".join(p["product"] for p in products)
+
+    return summary
+
+
+def generate_pdf_report(summary: dict, title: str = "SME Financial Health Report"):
+    """Render the summary to PDF bytes in memory (nothing is written to disk)."""
+    with span("pdf.render"):
+        return _render_pdf(summary, title)
+
+
+def _render_pdf(summary: dict, title: str):
+    from fpdf import FPDF  # only report workers pay for importing it
+
     pdf = FPDF()
     pdf.add_page()
-    pdf.set_font("Arial", "B", 16)
 
-    pdf.cell(200, 10, "SME Financial Health Report", ln=True)
+    unicode_font = bool(REPORT_FONT_PATH)
+    if unicode_font:
+        pdf.add_font("Report", "", REPORT_FONT_PATH, uni=True)
+        pdf.set_font("Report", size=16)
+    else:
+        pdf.set_font("Arial", "B", 16)
 
-    pdf.set_font("Arial", size=12)
+    pdf.cell(200, 10, _text(title, unicode_font), ln=True)
+
+    if unicode_font:
+        pdf.set_font("Report", size=12)
+    else:
+        pdf.set_font("Arial", size=12)
     pdf.cell(200, 10, f"Generated on: {datetime.now()}", ln=True)
     pdf.ln(5)
 
     for k, v in summary.items():
-        pdf.cell(200, 10, f"{k}: {v}", ln=True)
+        if isinstance(v, list):
+            pdf.cell(200, 10, _text(f"{k}:", unicode_font), ln=True)
+            for item in v:
+                pdf.multi_cell(0, 8, _text(f"  - {item}", unicode_font))
+                pdf.set_x(pdf.l_margin)  # fpdf2 leaves multi_cell at the right edge
+        else:
+            pdf.cell(200, 10, _text(f"{k}: {v}", unicode_font), ln=True)
+
+    output = pdf.output(dest="S")
+    # fpdf 1.x returns a latin-1 str, fpdf2 returns a bytearray
+    return output.encode("latin-1") if isinstance(output, str) else bytes(output)
+
+
+def _render_pool():
+    """One process pool per server process, started on first use and shared by every bulk job.
+
+    Spawned rather than forked: the first user is a job thread in a
+    multi-threaded server, and forking that is not safe.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=REPORT_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+        return _pool
 
-    file_path = "sme_financial_report.pdf"
-    pdf.output(file_path)
 
-    return file_path
\ No newline at end of file
+def generate_pdf_reports(summaries):
+    """Render many summaries in parallel processes (PDF layout is pure Python and GIL-bound)."""
+    global _pool
+    pool = _render_pool()
+    try:
+        return list(pool.map(generate_pdf_report, summaries))
+    except BrokenProcessPool:
+        # A worker died; the next bulk job starts a fresh pool
+        with _pool_lock:
+            if _pool is pool:
+                _pool = None
+        raise
@@ -0,0 +1,115 @@
+import io
+import time
+import zipfile
+
+from sqlalchemy import select
+
+from app.ai.resilience import RequestBudget, current_budget, llm_degraded
+from app.config import LLM_JOB_BUDGET, REPORT_WORKERS, REPORT_CACHE_SIZE
+from app.database import SessionLocal
+from app.models.rollup import MonthlyRollup
+from app.services.assessment import load_and_assess
+from app.services.data_version import get_data_version
+from app.services.jobs import JobQueue
+from app.services.report_generator import (
+    REPORT_SECTIONS, build_report_summary, generate_pdf_report, generate_pdf_reports
+)
+from app.services.result_cache import InMemoryCache, ResultCache
+from app.services.rules import rules_version
+
+report_queue = JobQueue(workers=REPORT_WORKERS, name="reports")
+
+# Keyed on the data version, so entries never go stale - only evicted
+report_cache = ResultCache(InMemoryCache(maxsize=REPORT_CACHE_SIZE, ttl=float("inf")))
+
+
+def report_key(db, business_id: int, lang: str):
+    return ("report", business_id, get_data_version(db, business_id), lang, rules_version())
+
+
+def report_summary(db, business_id: int, lang: str = "en"):
+    assessment = load_and_assess(db, business_id, REPORT_SECTIONS, lang=lang)
+    return build_report_summary(assessment)
+
+
+def _isolated_summary(db, business_id: int, lang: str):
+    """report_summary under its own budget, so one business's fallback doesn't mark the others degraded.
+
+    The deadline is whatever is left of the job's; returns (summary, degraded).
+    """
+    job_budget = current_budget.get()
+    seconds = job_budget.deadline - time.monotonic() if job_budget is not None else LLM_JOB_BUDGET
+    budget = RequestBudget(seconds)
+    token = current_budget.set(budget)
+    try:
+        summary = report_summary(db, business_id, lang)
+    finally:
+        current_budget.reset(token)
+    if budget.degraded and job_budget is not None:
+        job_budget.degraded = True
+    return summary, budget.degraded
+
+
+def render_report(db, business_id: int, lang: str = "en"):
+    return report_cache.get_or_compute(
+        report_key(db, business_id, lang),
+        lambda: generate_pdf_report(report_summary(db, business_id, lang)),
+        cacheable=lambda: not llm_degraded()
+    )
+
+
+def _report_job(job, business_id: int, lang: str):
+    job.set_progress(0, 1)
+    db = SessionLocal()
+    try:
+        pdf = render_report(db, business_id, lang)
+    finally:
+        db.close()
+    job.set_progress(1)
+    return pdf
+
+
+def _bulk_report_job(job, business_ids, lang: str):
+    db = SessionLocal()
+    try:
+        if business_ids is None:
+            business_ids = db.execute(
+                select(MonthlyRollup.business_id).distinct().order_by(MonthlyRollup.business_id)
+            ).scalars().all()
+
+        job.set_progress(0, len(business_ids))
+        pdfs = {}
+        pending = []
+
+        for business_id in business_ids:
+            key = report_key(db, business_id, lang)
+            cached = report_cache.lookup(key)
+            if cached is not None:
+                pdfs[business_id] = cached
+            else:
+                pending.append((business_id, key, *_isolated_summary(db, business_id, lang)))
+    finally:
+        db.close()
+
+    job.set_progress(len(pdfs))
+    if pending:
+        rendered = generate_pdf_reports([summary for _, _, summary, _ in pending])
+        for (business_id, key, _, degraded), pdf in zip(pending, rendered):
+            if not degraded:
+                report_cache.store(key, pdf)
+            pdfs[business_id] = pdf
+    job.set_progress(len(pdfs))
+
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as archive:
+        for business_id in business_ids:
+            archive.writestr(f"SME_Financial_Report_{business_id}.pdf", pdfs[business_id])
+    return buffer.getvalue()
+
+
+def submit_report(business_id: int, lang: str = "en"):
+    return report_queue.submit("report", _report_job, business_id, lang)
+
+
+def submit_bulk_reports(business_ids=None, lang: str = "en"):
+    return report_queue.submit("bulk_report", _bulk_report_job, business_ids, lang)
@@ -0,0 +1,107 @@
+import threading
+import time
+from collections import OrderedDict
+
+from app.config import RESULT_CACHE_SIZE, RESULT_CACHE_TTL
+
+_MISSING = object()
+
+
+class CacheBackend:
+    """Storage interface for ResultCache; implement get/set/clear for a shared store."""
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class InMemoryCache(CacheBackend):
+    """Bounded LRU with a per-entry TTL, safe to share between worker threads."""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING:
+                return _MISSING
+
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return _MISSING
+
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class ResultCache:
+    def __init__(self, backend: CacheBackend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def lookup(self, key, default=None):
+        value = self.backend.get(key)
+        with self._lock:
+            if value is _MISSING:
+                self.misses += 1
+                return default
+            self.hits += 1
+        return value
+
+    def store(self, key, value):
+        self.backend.set(key, value)
+
+    def get_or_compute(self, key, compute, cacheable=None):
+        """`cacheable()`, if given, is asked after computing whether the value may be stored."""
+        value = self.lookup(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            if cacheable is None or cacheable():
+                self.store(key, value)
+        return value
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else None
+        }
+
+
+result_cache = ResultCache(InMemoryCache(maxsize=RESULT_CACHE_SIZE, ttl=RESULT_CACHE_TTL))
+
+
+def set_cache_backend(backend: CacheBackend):
+    result_cache.backend = backend
+
+
+def make_key(endpoint: str, params: dict, business_id: int, data_version: int):
+    return (endpoint, tuple(sorted(params.items())), business_id, data_version)
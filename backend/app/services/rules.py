@@ -0,0 +1,166 @@
+import hashlib
+import json
+import logging
+import operator
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from app.config import SCORING_RULES_PATH
+
+OPERATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+_lock = threading.Lock()
+_state = {"mtime": None, "rules": None, "version": None}
+
+
+def _validate(rules: dict):
+    for component in rules["health_score"]["components"]:
+        for tier in component["tiers"]:
+            _check_conditions(tier["when"])
+    for tier in rules["lending_readiness"]["tiers"]:
+        _check_conditions(tier["when"])
+    for blocker in rules["credit_blockers"]:
+        _check_conditions(blocker["when"])
+    for product in rules["products"]:
+        if not product.get("fallback"):
+            _check_conditions(product["when"])
+
+
+def _check_conditions(conditions):
+    for condition in conditions:
+        op = condition[1]
+        if op not in OPERATORS and op not in ("is_null", "not_null"):
+            raise ValueError(f"Unknown rule operator: {op}")
+
+
+def get_rules():
+    """Return the current rule table, re-reading the file whenever it changes on disk.
+
+    A file that fails to parse or validate is logged and ignored, so a bad
+    edit keeps the last good rules in force.
+    """
+    try:
+        mtime = os.stat(SCORING_RULES_PATH).st_mtime_ns
+    except OSError:
+        mtime = None
+
+    if mtime == _state["mtime"] and _state["rules"] is not None:
+        return _state["rules"]
+
+    with _lock:
+        if mtime != _state["mtime"] or _state["rules"] is None:
+            try:
+                with open(SCORING_RULES_PATH, "rb") as f:
+                    raw = f.read()
+                rules = json.loads(raw)
+                _validate(rules)
+            except Exception as e:
+                if _state["rules"] is None:
+                    raise
+                logging.error(f"Ignoring invalid scoring rules in {SCORING_RULES_PATH}: {e}")
+            else:
+                _state["rules"] = rules
+                _state["version"] = hashlib.sha256(raw).hexdigest()[:16]
+            _state["mtime"] = mtime
+
+    return _state["rules"]
+
+
+def rules_version():
+    get_rules()
+    return _state["version"]
+
+
+def _column(df: pd.DataFrame, field: str, numeric: bool):
+    if field not in df.columns:
+        return pd.Series(np.nan, index=df.index)
+    column = df[field]
+    return pd.to_numeric(column, errors="coerce") if numeric else column
+
+
+def evaluate_conditions(df: pd.DataFrame, conditions):
+    """AND together [field, op, value] conditions; missing or null values never match a comparison."""
+    mask = np.ones(len(df), dtype=bool)
+
+    for condition in conditions:
+        field, op = condition[0], condition[1]
+
+        if op == "is_null":
+            mask &= _column(df, field, numeric=False).isna().to_numpy()
+            continue
+        if op == "not_null":
+            mask &= _column(df, field, numeric=False).notna().to_numpy()
+            continue
+
+        value = condition[2]
+        column = _column(df, field, numeric=not isinstance(value, str))
+        mask &= (OPERATORS[op](column, value) & column.notna()).to_numpy()
+
+    return mask
+
+
+def _select(df: pd.DataFrame, tiers, value_key, default):
+    if not tiers:
+        return np.full(len(df), default)
+
+    return np.select(
+        [evaluate_conditions(df, tier["when"]) for tier in tiers],
+        [tier[value_key] for tier in tiers],
+        default=default
+    )
+
+
+def health_scores(df: pd.DataFrame, rules=None):
+    rules = (rules or get_rules())["health_score"]
+    total = np.zeros(len(df), dtype=np.int64)
+
+    for component in rules["components"]:
+        total += _select(df, component["tiers"], "points", component["default"]).astype(np.int64)
+
+    return np.minimum(total, rules["max"])
+
+
+def lending_readiness(df: pd.DataFrame, rules=None):
+    rules = (rules or get_rules())["lending_readiness"]
+    return _select(df, rules["tiers"], "value", rules["default"])
+
+
+def credit_blocker_flags(df: pd.DataFrame, rules=None):
+    """One boolean column per blocker message; expects a lending_readiness column."""
+    rules = rules or get_rules()
+    return pd.DataFrame(
+        {b["message"]: evaluate_conditions(df, b["when"]) for b in rules["credit_blockers"]},
+        index=df.index
+    )
+
+
+def product_flags(df: pd.DataFrame, rules=None):
+    """One boolean column per product key, with fallback products set where nothing else matched."""
+    rules = rules or get_rules()
+    flags = pd.DataFrame(index=df.index)
+
+    for product in rules["products"]:
+        if not product.get("fallback"):
+            flags[product["key"]] = evaluate_conditions(df, product["when"])
+
+    matched = flags.any(axis=1).to_numpy() if len(flags.columns) else np.zeros(len(df), dtype=bool)
+    for product in rules["products"]:
+        if product.get("fallback"):
+            flags[product["key"]] = ~matched
+
+    return flags[[p["key"] for p in rules["products"]]]
+
+
+def product_catalogue(rules=None):
+    rules = rules or get_rules()
+    return [(p["key"], p["product"], p["reason"]) for p in rules["products"]]
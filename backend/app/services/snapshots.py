@@ -0,0 +1,310 @@
+import json
+import logging
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from sqlalchemy import select, func, Integer, Float, String, Date
+
+from app.config import SNAPSHOT_DIR, SNAPSHOT_BATCH_ROWS
+from app.instrumentation import record_rows
+from app.models.financial import Transaction
+from app.models.gst import GSTReturn
+from app.models.loan import Loan
+from app.services.ledger import CompactLedger
+
+SNAPSHOT_TABLES = {
+    "transactions": Transaction.__table__,
+    "loans": Loan.__table__,
+    "gst_returns": GSTReturn.__table__,
+}
+MANIFEST = "manifest.json"
+
+
+def _arrow_type(column_type):
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, Float):
+        return pa.float64()
+    if isinstance(column_type, Date):
+        return pa.date32()
+    if isinstance(column_type, String):
+        return pa.string()
+    raise NotImplementedError(f"No Arrow type for {column_type!r}")
+
+
+def snapshot_schema(name: str):
+    return pa.schema([(c.name, _arrow_type(c.type)) for c in SNAPSHOT_TABLES[name].columns])
+
+
+def _partition(root: str, name: str, business_id: int):
+    return os.path.join(root, name, f"business_id={business_id}")
+
+
+def _part_range(filename: str):
+    # part-<first id>-<last id>.arrow: the id range of the export that wrote it
+    first, last = filename[len("part-"):-len(".arrow")].split("-")
+    return int(first), int(last)
+
+
+def _parts(directory: str):
+    if not os.path.isdir(directory):
+        return []
+    return sorted(f for f in os.listdir(directory) if f.startswith("part-") and f.endswith(".arrow"))
+
+
+def read_manifest(root: str = SNAPSHOT_DIR):
+    try:
+        with open(os.path.join(root, MANIFEST)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _write_manifest(root: str, manifest: dict):
+    path = os.path.join(root, MANIFEST)
+    with open(path + ".tmp", "w") as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(path + ".tmp", path)
+
+
+def _drop_parts_after(root: str, name: str, after_id: int):
+    """Remove what an interrupted export left behind: temp files and parts past the manifest."""
+    table_dir = os.path.join(root, name)
+    if not os.path.isdir(table_dir):
+        return
+    for partition in os.listdir(table_dir):
+        directory = os.path.join(table_dir, partition)
+        for filename in os.listdir(directory):
+            if filename.endswith(".tmp") or (
+                filename.startswith("part-") and _part_range(filename)[0] > after_id
+            ):
+                os.remove(os.path.join(directory, filename))
+
+
+class _PartWriter:
+    """One business's Arrow file for one export, renamed into place only once complete."""
+
+    def __init__(self, path: str, schema):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.sink = pa.OSFile(path + ".tmp", "wb")
+        self.writer = pa.ipc.new_file(self.sink, schema)
+
+    def write(self, table):
+        self.writer.write_table(table)
+
+    def close(self):
+        self.writer.close()
+        self.sink.close()
+        os.replace(self.path + ".tmp", self.path)
+
+
+def _export_table(db, root: str, name: str, manifest: dict, full: bool, batch_rows: int):
+    table = SNAPSHOT_TABLES[name]
+    schema = snapshot_schema(name)
+    exported = manifest.get(name, {"through_id": 0, "rows": 0})
+    after = exported["through_id"]
+
+    # Rows committed late with an id below the mark (or deleted since) would be
+    # missed by an id-keyed append, so a changed count means starting over
+    if not full and after:
+        rows_below = db.execute(
+            select(func.count()).select_from(table)
+            .where(table.c.id <= after, table.c.business_id.is_not(None))
+        ).scalar()
+        if rows_below != exported["rows"]:
+            logging.warning(
+                f"{name}: {rows_below} rows up to id {after}, {exported['rows']} exported; re-exporting in full"
+            )
+            full = True
+    if full:
+        after = 0
+        exported = {"through_id": 0, "rows": 0}
+
+    _drop_parts_after(root, name, after)
+    through = db.execute(select(func.max(table.c.id))).scalar() or 0
+    if through <= after:
+        return {"rows": 0, "businesses": 0, "through_id": after}
+
+    # Grouped by business so only one part file is open at a time
+    result = db.connection().execution_options(stream_results=True).execute(
+        select(*table.columns)
+        .where(table.c.id > after, table.c.id <= through, table.c.business_id.is_not(None))
+        .order_by(table.c.business_id, table.c.id)
+    )
+    filename = f"part-{after + 1:012d}-{through:012d}.arrow"
+    writer = None
+    current = None
+    rows = businesses = 0
+    try:
+        for batch in result.partitions(batch_rows):
+            arrays = [pa.array(values, type=field.type) for values, field in zip(zip(*batch), schema)]
+            chunk = pa.Table.from_arrays(arrays, schema=schema)
+            business_ids = chunk.column("business_id").to_numpy()
+
+            cuts = (np.flatnonzero(np.diff(business_ids)) + 1).tolist()
+            for start, stop in zip([0, *cuts], [*cuts, len(chunk)]):
+                business_id = int(business_ids[start])
+                if business_id != current:
+                    if writer is not None:
+                        writer.close()
+                    writer = _PartWriter(os.path.join(_partition(root, name, business_id), filename), schema)
+                    current = business_id
+                    businesses += 1
+                writer.write(chunk.slice(start, stop - start))
+            rows += len(chunk)
+        if writer is not None:
+            writer.close()
+    finally:
+        result.close()
+
+    manifest[name] = {"through_id": through, "rows": exported["rows"] + rows}
+    _write_manifest(root, manifest)
+    record_rows(rows)
+    return {"rows": rows, "businesses": businesses, "through_id": through}
+
+
+def export_snapshots(db, root: str = SNAPSHOT_DIR, tables=tuple(SNAPSHOT_TABLES), full: bool = False,
+                     batch_rows: int = SNAPSHOT_BATCH_ROWS):
+    """Append every row added since the last export to per-business Arrow files.
+
+    Layout is `<root>/<table>/business_id=<id>/part-<first id>-<last id>.arrow`,
+    one part per business per export, with the last exported id of each
+    table kept in `<root>/manifest.json`. Only inserts are picked up:
+    categories rewritten by recategorize reach the snapshot with `full=True`.
+    """
+    os.makedirs(root, exist_ok=True)
+    manifest = read_manifest(root)
+    return {name: _export_table(db, root, name, manifest, full, batch_rows) for name in tables}
+
+
+def snapshot_business_ids(name: str = "transactions", root: str = SNAPSHOT_DIR):
+    table_dir = os.path.join(root, name)
+    if not os.path.isdir(table_dir):
+        return []
+    return sorted(
+        int(p.split("=", 1)[1]) for p in os.listdir(table_dir)
+        if p.startswith("business_id=") and _parts(os.path.join(table_dir, p))
+    )
+
+
+def read_snapshot(name: str, business_id: int, columns=None, root: str = SNAPSHOT_DIR):
+    """One business's exported rows as an Arrow table backed by the memory-mapped files.
+
+    Nothing is read up front: pages are faulted in as columns are touched,
+    so selecting two columns of a wide table costs two columns of I/O.
+    """
+    directory = _partition(root, name, business_id)
+    tables = [pa.ipc.open_file(pa.memory_map(os.path.join(directory, f))).read_all() for f in _parts(directory)]
+    if not tables:
+        tables = [snapshot_schema(name).empty_table()]
+
+    table = pa.concat_tables(tables)
+    record_rows(table.num_rows)
+    return table.select(list(columns)) if columns is not None else table
+
+
+def _to_frame(table):
+    df = table.to_pandas(date_as_object=False)
+    for name in df.columns:
+        if pa.types.is_date32(table.schema.field(name).type):
+            df[name] = df[name].astype("datetime64[ns]")
+    return df
+
+
+def _date_window(table, start, end):
+    if start is not None:
+        table = table.filter(pc.greater_equal(table["date"], pa.scalar(start, pa.date32())))
+    if end is not None:
+        table = table.filter(pc.less_equal(table["date"], pa.scalar(end, pa.date32())))
+    return table
+
+
+def load_transactions(business_id: int, start=None, end=None, columns=("date", "amount"), root: str = SNAPSHOT_DIR):
+    """data_access.load_transactions, read from the snapshot instead of the database."""
+    table = read_snapshot("transactions", business_id, root=root)
+    return _to_frame(_date_window(table, start, end).select(list(columns)))
+
+
+def load_ledger(business_id: int, start=None, end=None, root: str = SNAPSHOT_DIR):
+    """The CompactLedger straight from the mapped columns, without a DataFrame in between."""
+    table = _date_window(read_snapshot("transactions", business_id, ("date", "amount"), root), start, end)
+    table = table.filter(pc.is_valid(table["date"]))
+
+    days = table["date"].cast(pa.int32()).to_numpy()
+    months = days.astype("datetime64[D]").astype("datetime64[M]").astype("int32")
+    amounts = table["amount"].fill_null(0).to_numpy()
+    return CompactLedger(months, np.nan_to_num(amounts))
+
+
+def load_loans(business_id: int, columns=("monthly_emi",), root: str = SNAPSHOT_DIR):
+    return _to_frame(read_snapshot("loans", business_id, columns, root))
+
+
+def load_gst_returns(
+    business_id: int,
+    start=None,
+    end=None,
+    columns=("period", "output_gst", "input_gst", "filed"),
+    root: str = SNAPSHOT_DIR
+):
+    table = read_snapshot("gst_returns", business_id, root=root)
+    if start is not None:
+        table = table.filter(pc.greater_equal(table["period"], start.strftime("%Y-%m")))
+    if end is not None:
+        table = table.filter(pc.less_equal(table["period"], end.strftime("%Y-%m")))
+    return _to_frame(table.sort_by("period").select(list(columns)))
+
+
+def load_monthly_portfolio(business_ids=None, root: str = SNAPSHOT_DIR):
+    """The long (business_id, month, inflow, outflow, net) frame the rollup table holds, from the ledgers."""
+    if business_ids is None:
+        business_ids = snapshot_business_ids("transactions", root)
+
+    owners, ordinals, inflows, outflows, nets = [], [], [], [], []
+    for business_id in business_ids:
+        months, inflow, outflow, net, _ = load_ledger(business_id, root=root).monthly()
+        owners.append(np.full(len(months), business_id, dtype="int64"))
+        ordinals.append(months)
+        inflows.append(inflow)
+        outflows.append(outflow)
+        nets.append(net)
+
+    if not owners:
+        return pd.DataFrame(columns=["business_id", "month", "inflow", "outflow", "net"])
+
+    return pd.DataFrame({
+        "business_id": np.concatenate(owners),
+        "month": pd.PeriodIndex.from_ordinals(np.concatenate(ordinals), freq="M").strftime("%Y-%m"),
+        "inflow": np.concatenate(inflows),
+        "outflow": np.concatenate(outflows),
+        "net": np.concatenate(nets),
+    })
+
+
+def _all_partitions(name: str, business_ids, columns, root: str):
+    if business_ids is None:
+        business_ids = snapshot_business_ids(name, root)
+    tables = [read_snapshot(name, b, columns, root) for b in business_ids]
+    return _to_frame(pa.concat_tables(tables) if tables else snapshot_schema(name).empty_table().select(columns))
+
+
+def load_portfolio(business_ids=None, root: str = SNAPSHOT_DIR):
+    """portfolio.load_portfolio over the snapshot: the same three frames, no database connection."""
+    monthly = load_monthly_portfolio(business_ids, root)
+
+    # Sums with min_count=1 so an all-NULL group stays NULL, as SUM does in SQL
+    loans = _all_partitions("loans", business_ids, ["business_id", "monthly_emi"], root)
+    loans = loans.groupby("business_id")[["monthly_emi"]].sum(min_count=1)\
+        .rename(columns={"monthly_emi": "total_monthly_emi"})
+
+    gst = _all_partitions("gst_returns", business_ids, ["business_id", "output_gst", "input_gst", "filed"], root)
+    grouped = gst.assign(unfiled_count=gst["filed"].eq(0).astype("int64")).groupby("business_id")
+    gst = grouped[["output_gst", "input_gst"]].sum(min_count=1)\
+        .rename(columns={"output_gst": "total_output_gst", "input_gst": "total_input_gst"})
+    gst["unfiled_count"] = grouped["unfiled_count"].sum()
+
+    return monthly, loans, gst
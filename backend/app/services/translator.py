@@ -1,23 +1,150 @@
-import os
-from openai import OpenAI
+import hashlib
+import json
+import logging
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
 
-def translate_text(text: str, target_lang: str):
-    if target_lang == "en":
-        return text
+from app.ai.clients import get_client
+from app.ai.resilience import guarded_call, mark_degraded
+from app.config import TRANSLATION_CACHE_SIZE
+from app.constants.languages import SUPPORTED_LANGUAGES
+from app.database import SessionLocal
+from app.instrumentation import span
+from app.models.translation import Translation
+from app.services.result_cache import InMemoryCache, ResultCache
+
+
+# No TTL: a phrase's translation does not go stale
+phrase_cache = ResultCache(InMemoryCache(maxsize=TRANSLATION_CACHE_SIZE, ttl=float("inf")))
+
+
+def _source_hash(text: str):
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _load_memo(db, texts, target_lang: str):
+    hashes = {_source_hash(t): t for t in texts}
+    rows = db.execute(
+        select(Translation.source_hash, Translation.translated_text).where(
+            Translation.language == target_lang,
+            Translation.source_hash.in_(list(hashes))
+        )
+    ).all()
+    return {hashes[h]: translated for h, translated in rows}
+
+
+def _save_memo(db, translations: dict, target_lang: str):
+    if not translations:
+        return
+
+    known = _load_memo(db, list(translations), target_lang)
+    rows = [
+        {
+            "source_hash": _source_hash(text),
+            "language": target_lang,
+            "source_text": text,
+            "translated_text": translated
+        }
+        for text, translated in translations.items()
+        if text not in known
+    ]
+    if not rows:
+        return
 
     try:
+        db.execute(insert(Translation.__table__), rows)
+        db.commit()
+    except IntegrityError:
+        # another worker memoised the same phrase first
+        db.rollback()
+
+
+def _request_batch(texts, target_lang: str, llm_client=None):
+    """Translate several strings in one completion.
+
+    A reply that can't be split back into one string per input raises
+    inside the guarded call, so it counts against the breaker like any
+    other failed completion.
+    """
+    language = SUPPORTED_LANGUAGES.get(target_lang, target_lang)
+
+    def complete(timeout):
+        client = llm_client or get_client()
         response = client.chat.completions.create(
             model="gpt-4o-mini",
+            timeout=timeout,
             messages=[
                 {
                     "role": "user",
-                    "content": f"Translate the following business text to Hindi in simple language:\n{text}"
+                    "content": (
+                        f"Translate each of the following business texts to {language} in simple language.\n"
+                        "Reply with only a JSON array of strings, in the same order and with the same "
+                        "number of items as the input.\n"
+                        f"{json.dumps(texts, ensure_ascii=False)}"
+                    )
                 }
             ]
         )
-        return response.choices[0].message.content
-    except Exception:
-        # fail safe
-        return text
\ No newline at end of file
+        content = response.choices[0].message.content.strip()
+        if content.startswith("```"):
+            content = content.strip("`").removeprefix("json").strip()
+
+        translated = json.loads(content)
+        if not isinstance(translated, list) or len(translated) != len(texts):
+            raise ValueError(f"Expected a JSON array of {len(texts)} translations")
+        return [str(t) for t in translated]
+
+    with span("llm.translate"):
+        return guarded_call(complete)
+
+
+def translate_batch(texts, target_lang: str, llm_client=None):
+    """Translate many strings with at most one LLM round-trip.
+
+    Lookups go in-memory LRU -> translations table -> one batched completion
+    for whatever is still missing. Anything that fails falls back to the
+    source text and is not memoised.
+    """
+    texts = list(texts)
+    if target_lang == "en" or not texts:
+        return texts
+
+    found = {}
+    for text in set(texts):
+        cached = phrase_cache.lookup((text, target_lang))
+        if cached is not None:
+            found[text] = cached
+
+    missing = [t for t in dict.fromkeys(texts) if t not in found]
+    if missing:
+        db = SessionLocal()
+        try:
+            from_memo = _load_memo(db, missing, target_lang)
+            found.update(from_memo)
+            for text, translated in from_memo.items():
+                phrase_cache.store((text, target_lang), translated)
+
+            missing = [t for t in missing if t not in found]
+            if missing:
+                try:
+                    translated = _request_batch(missing, target_lang, llm_client)
+                except Exception as e:
+                    logging.error(f"Batch translation failed: {e}")
+                    # Source text stands in, so the response must not be cached as translated
+                    mark_degraded()
+                else:
+                    fresh = dict(zip(missing, translated))
+                    _save_memo(db, fresh, target_lang)
+                    found.update(fresh)
+                    for text, value in fresh.items():
+                        phrase_cache.store((text, target_lang), value)
+        finally:
+            db.close()
+
+    # fail safe
+    return [found.get(t, t) for t in texts]
+
+
+def translate_text(text: str, target_lang: str):
+    return translate_batch([text], target_lang)[0]
@@ -0,0 +1,84 @@
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+
+from app.config import UPLOAD_WORKERS
+from app.database import SessionLocal
+from app.services.categorizer import recategorize
+from app.services.dashboard_stream import broadcaster
+from app.services.ingest import REQUIRED_COLUMNS, ingest_csv
+from app.services.jobs import JobQueue
+
+upload_queue = JobQueue(workers=UPLOAD_WORKERS, name="uploads")
+
+
+def stage_upload(fileobj):
+    """Copy the request body to a temp file the job can read after the request ends.
+
+    The header is checked here so a malformed file is rejected immediately
+    instead of becoming a failed job.
+    """
+    staged = tempfile.NamedTemporaryFile(prefix="upload-", suffix=".csv", delete=False)
+    try:
+        with staged:
+            shutil.copyfileobj(fileobj, staged, length=1024 * 1024)
+
+        try:
+            header = pd.read_csv(staged.name, nrows=0).columns
+        except pd.errors.EmptyDataError:
+            raise ValueError("CSV file is empty")
+
+        missing = REQUIRED_COLUMNS - set(header)
+        if missing:
+            raise ValueError(f"CSV is missing columns: {', '.join(sorted(missing))}")
+    except Exception:
+        os.unlink(staged.name)
+        raise
+
+    return staged.name
+
+
+def _upload_job(job, path: str, business_id: int):
+    db = SessionLocal()
+    try:
+        with open(path, "rb") as source:
+            total = os.fstat(source.fileno()).st_size
+            job.set_progress(0, total)
+            # Progress is bytes of the file consumed so far
+            result = ingest_csv(
+                source, db, business_id=business_id,
+                on_chunk=lambda _: job.set_progress(min(source.tell(), total))
+            )
+        job.set_progress(total)
+        if result["rows_inserted"]:
+            broadcaster.publish(business_id)
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+        os.unlink(path)
+
+
+def submit_upload(fileobj, business_id: int = 1):
+    path = stage_upload(fileobj)
+    return upload_queue.submit("upload", _upload_job, path, business_id)
+
+
+def _recategorize_job(job, business_id):
+    db = SessionLocal()
+    try:
+        return recategorize(db, business_id, on_batch=job.set_progress)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def submit_recategorize(business_id: int = None):
+    """Re-apply an edited category dictionary to stored rows (one business, or all)."""
+    return upload_queue.submit("recategorize", _recategorize_job, business_id)
@@ -0,0 +1,49 @@
+from collections import Counter
+
+import pandas as pd
+from sqlalchemy import select, update, bindparam
+
+from app.database import SessionLocal
+from app.models.financial import Transaction
+from app.services.ingest import fingerprint_chunk
+
+# Run once after create_tables.py adds the column, before accepting uploads:
+# rows stored before fingerprinting get the same fingerprints an upload of
+# them would, so re-uploading an old statement is deduplicated too.
+BATCH = 50000
+
+db = SessionLocal()
+table = Transaction.__table__
+business_ids = db.execute(
+    select(table.c.business_id).where(table.c.fingerprint.is_(None)).distinct()
+).scalars().all()
+
+updated = 0
+for business_id in business_ids:
+    seen = Counter()
+    last_id = 0
+    while True:
+        rows = db.execute(
+            select(table.c.id, table.c.date, table.c.amount, table.c.description, table.c.business_id)
+            .where(table.c.business_id == business_id, table.c.fingerprint.is_(None), table.c.id > last_id)
+            .order_by(table.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            break
+
+        chunk = pd.DataFrame(rows, columns=["id", "date", "amount", "description", "business_id"])
+        chunk["date"] = pd.to_datetime(chunk["date"])
+        chunk["description"] = chunk["description"].fillna("")
+        chunk["fingerprint"] = fingerprint_chunk(chunk, seen)
+
+        db.connection().execute(
+            update(table).where(table.c.id == bindparam("b_id")).values(fingerprint=bindparam("b_fingerprint")),
+            [{"b_id": i, "b_fingerprint": f} for i, f in zip(chunk["id"].tolist(), chunk["fingerprint"])]
+        )
+        updated += len(chunk)
+        last_id = int(chunk["id"].iloc[-1])
+    db.commit()
+
+db.close()
+print(f"Fingerprinted {updated} transactions across {len(business_ids)} businesses")
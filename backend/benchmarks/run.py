@@ -0,0 +1,351 @@
+"""Performance benchmark suite.
+
+Each size runs in its own process against a fresh SQLite database filled by
+benchmarks.synthetic, so timings, peak memory and caches never leak between
+sizes. Every service in app/services and every /analysis route is measured,
+plus a cold `import app.main`. The LLM-backed insights and translation paths
+are left out because they would time the network, not this code.
+
+    python -m benchmarks.run --save-baseline               # record benchmarks/baseline.json
+    python -m benchmarks.run                               # fail on regressions against it
+    python -m benchmarks.run --sizes 1000,10000000 --repeat 3
+
+Baselines are machine-specific; record one on the machine that compares.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, "baseline.json")
+DEFAULT_SIZES = "1000,10000,100000"
+
+ANALYSIS_ROUTES = (
+    "/analysis/financial-health",
+    "/analysis/creditworthiness",
+    "/analysis/cashflow-forecast",
+    "/analysis/cashflow-forecast?model=holt",
+    "/analysis/gst-compliance",
+    "/analysis/industry-benchmark",
+    "/analysis/industry-benchmark?mode=percentile",
+    "/analysis/financial-products",
+    "/analysis/scenarios?paths=10000&seed=1",
+    "/analysis/assessment?sections=health,credit,forecast,gst,benchmark,products",
+    "/analysis/assessment?sections=health,credit,forecast,gst,benchmark,products&from=2025-01-01&to=2025-06-30",
+)
+
+
+def measure(fn, rows: int, repeat: int, reset=None):
+    """Median latency over `repeat` timed runs, then one traced run for peak memory."""
+    reset = reset or (lambda: None)
+
+    reset()
+    fn()  # warm-up: imports, first-touch allocations, SQLite page cache
+
+    timings = []
+    for _ in range(repeat):
+        reset()
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+
+    reset()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    latency = statistics.median(timings)
+    return {
+        "rows": rows,
+        "latency_ms": round(latency * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "peak_mb": round(peak / 2 ** 20, 3),
+        "rows_per_second": round(rows / latency, 1) if latency > 0 else None,
+    }
+
+
+def run_size(size: int, businesses: int, repeat: int, seed: int):
+    """Load one synthetic portfolio into DATABASE_URL and measure every case on it."""
+    import io
+
+    import pandas as pd
+    from fastapi.testclient import TestClient
+
+    import create_tables  # noqa: F401 -- registers every model and creates the schema
+    from app.database import SessionLocal
+    from app.main import app
+    from app.services import (
+        assessment, benchmark_analysis, benchmark_registry, cashflow_forecast, categorizer, credit_analysis,
+        data_access, data_version, financial_analysis, forecast_engine, gst_analysis, ingest,
+        kpi_calculator, monthly_rollup, portfolio, product_recommendation, report_generator,
+        report_jobs, rules, scenarios, snapshots
+    )
+    from app.services.result_cache import result_cache
+    from benchmarks.synthetic import generate_transactions, load_database
+
+    businesses = max(1, min(businesses, size))
+    per_business = size // businesses
+
+    db = SessionLocal()
+    load_database(db, businesses, per_business, seed=seed)
+
+    def reset():
+        result_cache.backend.clear()
+        report_jobs.report_cache.backend.clear()
+
+    business_id = 1
+    transactions = data_access.load_transactions(db, business_id)
+    ledger = data_access.load_ledger(db, business_id)
+    descriptions = data_access.load_transactions(db, business_id, columns=("description",))["description"]
+    monthly = monthly_rollup.load_monthly_rollup(db, business_id)
+    loans = data_access.load_loans(db, business_id)
+    gst = data_access.load_gst_returns(db, business_id)
+    metrics = financial_analysis.compute_financial_metrics(transactions)
+    credit = credit_analysis.calculate_credit_metrics(transactions, loans)
+    forecast = cashflow_forecast.forecast_cashflow(transactions)
+    kpis = kpi_calculator.calculate_business_kpis(metrics, credit)
+    registry = benchmark_registry.get_registry(db, with_sketches=True)
+    benchmark = next(iter(registry.benchmarks.values()))
+    long_monthly = pd.read_sql("SELECT business_id, month, net FROM monthly_rollups", db.connection())
+    through = pd.Period(long_monthly["month"].max(), freq="M")
+    summary = report_jobs.report_summary(db, business_id)
+    snapshot_dir = tempfile.mkdtemp(prefix="snapshots-")
+    snapshots.export_snapshots(db, snapshot_dir)
+    csv = generate_transactions(1, per_business, seed=seed + 99)[["date", "description", "amount", "category"]]\
+        .to_csv(index=False, date_format="%Y-%m-%d").encode()
+
+    n = len(transactions)
+    services = {
+        "data_access.load_transactions": (lambda: data_access.load_transactions(db, business_id), n),
+        "data_access.load_loans": (lambda: data_access.load_loans(db, business_id), len(loans)),
+        "data_access.load_gst_returns": (lambda: data_access.load_gst_returns(db, business_id), len(gst)),
+        "snapshots.load_ledger": (lambda: snapshots.load_ledger(business_id, root=snapshot_dir), n),
+        "snapshots.export_snapshots": (lambda: snapshots.export_snapshots(db, snapshot_dir, full=True), size),
+        "data_version.get_data_version": (lambda: data_version.get_data_version(db, business_id), 1),
+        "monthly_rollup.summarize_monthly": (lambda: monthly_rollup.summarize_monthly(transactions), n),
+        "ledger.CompactLedger.monthly": (ledger.monthly, n),
+        "categorizer.categorize": (lambda: categorizer.get_category_matcher().categorize(descriptions), n),
+        "monthly_rollup.load_monthly_rollup": (lambda: monthly_rollup.load_monthly_rollup(db, business_id), len(monthly)),
+        "monthly_rollup.aggregate_monthly": (lambda: monthly_rollup.aggregate_monthly(db, business_id), n),
+        "monthly_rollup.rebuild_monthly_rollup": (lambda: monthly_rollup.rebuild_monthly_rollup(db, business_id), n),
+        "financial_analysis.compute_financial_metrics": (lambda: financial_analysis.compute_financial_metrics(transactions), n),
+        "financial_analysis.financial_health_score": (lambda: financial_analysis.financial_health_score(metrics), 1),
+        "credit_analysis.calculate_credit_metrics": (lambda: credit_analysis.calculate_credit_metrics(transactions, loans), n),
+        "cashflow_forecast.forecast_cashflow": (lambda: cashflow_forecast.forecast_cashflow(transactions, model="holt"), n),
+        "cashflow_forecast.runway_analysis": (lambda: cashflow_forecast.runway_analysis(forecast), 1),
+        "forecast_engine.refit": (lambda: forecast_engine.refit(long_monthly, through), size),
+        "gst_analysis.analyze_gst_compliance": (lambda: gst_analysis.analyze_gst_compliance(gst), len(gst)),
+        "kpi_calculator.calculate_business_kpis": (lambda: kpi_calculator.calculate_business_kpis(metrics, credit), 1),
+        "benchmark_analysis.compare_with_benchmark": (lambda: benchmark_analysis.compare_with_benchmark(kpis, benchmark), 1),
+        "benchmark_registry.build_sketches": (
+            lambda: benchmark_registry.build_sketches(benchmark_registry.population_kpis(db)), size
+        ),
+        "product_recommendation.recommend_financial_products": (
+            lambda: product_recommendation.recommend_financial_products(metrics, credit, gst_analysis.gst_filing_score(gst)), 1
+        ),
+        "rules.get_rules": (rules.get_rules, 1),
+        "assessment.run_assessment": (
+            lambda: assessment.run_assessment(
+                monthly, loans, gst, sections=[s for s in assessment.SECTIONS if s != "insights"], benchmark=benchmark
+            ), n
+        ),
+        "portfolio.score_portfolio": (lambda: portfolio.score_portfolio(db), size),
+        "snapshots.load_portfolio": (lambda: snapshots.load_portfolio(root=snapshot_dir), size),
+        "scenarios.run_scenario": (lambda: scenarios.run_scenario(monthly, float(loans["monthly_emi"].sum()), seed=1), 10000),
+        "report_generator.generate_pdf_report": (lambda: report_generator.generate_pdf_report(summary), 1),
+        "report_jobs.render_report": (lambda: report_jobs.render_report(db, business_id), n),
+    }
+
+    results = {}
+    for name, (fn, rows) in services.items():
+        results[name] = measure(fn, rows, repeat, reset)
+        db.rollback()
+        print(f"  {size:>10} {name}", file=sys.stderr)
+
+    with TestClient(app) as client:
+        for route in ANALYSIS_ROUTES:
+            url = f"{route}{'&' if '?' in route else '?'}business_id={business_id}"
+
+            def call(url=url):
+                response = client.get(url)
+                response.raise_for_status()
+
+            results["route:" + route] = measure(call, n, repeat, reset)
+            print(f"  {size:>10} {route}", file=sys.stderr)
+
+    # Last, since every upload adds rows: each run writes a brand-new business
+    upload_ids = iter(range(businesses + 1, businesses + repeat + 3))
+    results["ingest.ingest_csv"] = measure(
+        lambda: ingest.ingest_csv(io.BytesIO(csv), db, business_id=next(upload_ids)), per_business, repeat
+    )
+
+    db.close()
+    shutil.rmtree(snapshot_dir, ignore_errors=True)
+    return results
+
+
+def measure_startup(repeat: int, workdir: str):
+    """Cold `import app.main` in a fresh interpreter, with no OpenAI key configured."""
+    env = {k: v for k, v in os.environ.items() if k != "OPENAI_API_KEY"}
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'startup.db')}"
+    command = [
+        sys.executable, "-c",
+        "import time; t = time.perf_counter(); import app.main; print(time.perf_counter() - t)",
+    ]
+
+    timings = []
+    for _ in range(repeat + 1):
+        out = subprocess.run(command, cwd=os.path.dirname(HERE), env=env, capture_output=True, text=True, check=True)
+        timings.append(float(out.stdout.strip().splitlines()[-1]))
+    timings = timings[1:]  # the first run also warms the OS page cache
+
+    latency = statistics.median(timings)
+    return {
+        "rows": 0,
+        "latency_ms": round(latency * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "peak_mb": None,
+        "rows_per_second": None,
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float, min_delta_ms: float):
+    """Return the cases whose latency or peak memory regressed past the threshold."""
+    regressions = []
+    for key, current in sorted(results.items()):
+        base = baseline.get(key)
+        if base is None:
+            continue
+
+        for metric, floor in (("latency_ms", min_delta_ms), ("peak_mb", 1.0)):
+            before, after = base.get(metric), current.get(metric)
+            if before is None or after is None:
+                continue
+            # Tiny absolute changes are timer and allocator noise, not regressions
+            if after > before * (1 + threshold) and after - before > floor:
+                regressions.append((key, metric, before, after))
+    return regressions
+
+
+def print_table(results: dict, baseline: dict):
+    print(f"{'case':<84} {'latency ms':>12} {'vs base':>8} {'peak MB':>10} {'rows/s':>14}")
+    for key, r in sorted(results.items()):
+        base = baseline.get(key, {}).get("latency_ms")
+        ratio = f"{r['latency_ms'] / base:.2f}x" if base else "-"
+        rate = f"{r['rows_per_second']:,.0f}" if r["rows_per_second"] else "-"
+        peak = f"{r['peak_mb']:.2f}" if r["peak_mb"] is not None else "-"
+        print(f"{key:<84} {r['latency_ms']:>12.2f} {ratio:>8} {peak:>10} {rate:>14}")
+
+
+def spawn(size: int, args, workdir: str):
+    """Run one size in a child process with its own SQLite database."""
+    result_file = os.path.join(workdir, f"result_{size}.json")
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, f'bench_{size}.db')}",
+        OPENAI_API_KEY=os.environ.get("OPENAI_API_KEY", "benchmark"),
+        # Keep the incremental forecast state out of the caller's working tree
+        FORECAST_STATE_PATH=os.path.join(workdir, "forecast_state.npz"),
+    )
+    subprocess.run(
+        [
+            sys.executable, "-m", "benchmarks.run", "--worker",
+            "--size", str(size), "--businesses", str(args.businesses),
+            "--repeat", str(args.repeat), "--seed", str(args.seed),
+            "--result-file", result_file,
+        ],
+        cwd=os.path.dirname(HERE),
+        env=env,
+        stdout=subprocess.DEVNULL,
+        check=True,
+    )
+    with open(result_file) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark every service and /analysis route")
+    parser.add_argument("--sizes", default=DEFAULT_SIZES, help="comma-separated total transaction counts")
+    parser.add_argument("--businesses", type=int, default=10, help="businesses the rows are spread over")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="overwrite the baseline with this run")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown, 0.25 = 25%%")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="ignore smaller latency changes")
+    parser.add_argument("--output", help="also write this run's results as JSON")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        results = run_size(args.size, args.businesses, args.repeat, args.seed)
+        with open(args.result_file, "w") as f:
+            json.dump(results, f)
+        return
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    results = {}
+    with tempfile.TemporaryDirectory(prefix="sme-bench-") as workdir:
+        print("Benchmarking startup", file=sys.stderr)
+        results["startup.import_app_main"] = measure_startup(args.repeat, workdir)
+        for size in sizes:
+            print(f"Benchmarking {size:,} rows", file=sys.stderr)
+            for name, measured in spawn(size, args, workdir).items():
+                results[f"{name}@{size}"] = measured
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f).get("results", {})
+
+    print_table(results, baseline)
+
+    run = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "sizes": sizes,
+            "businesses": args.businesses,
+            "repeat": args.repeat,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(run, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(run, f, indent=2)
+        print(f"Saved baseline to {args.baseline}")
+        return
+
+    if not baseline:
+        print("No baseline to compare against; run with --save-baseline first")
+        return
+
+    regressions = compare(results, baseline, args.threshold, args.min_delta_ms)
+    for key, metric, before, after in regressions:
+        print(f"REGRESSION {key} {metric}: {before} -> {after} ({after / before:.2f}x)")
+    if regressions:
+        sys.exit(1)
+    print(f"No regressions beyond {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
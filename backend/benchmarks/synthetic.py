@@ -0,0 +1,202 @@
+"""Reproducible synthetic SME ledgers for benchmarking.
+
+Every frame is a pure function of (businesses, rows, seed), so two runs on
+different machines load byte-identical data.
+
+    python -m benchmarks.synthetic --businesses 50 --rows 20000 --csv sample.csv
+    DATABASE_URL=sqlite:///bench.db python -m benchmarks.synthetic --businesses 50 --rows 20000
+"""
+import argparse
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+INDUSTRIES = ("Retail", "Manufacturing", "Services", "Hospitality", "Wholesale")
+
+# (description, category, share of rows)
+SALES = (
+    ("UPI payment from customer", "Sales", 0.35),
+    ("POS card settlement", "Sales", 0.15),
+    ("NEFT invoice payment received", "Sales", 0.10),
+)
+EXPENSES = (
+    ("Supplier purchase", "Inventory", 0.20),
+    ("Salary transfer", "Payroll", 0.06),
+    ("Shop rent", "Rent", 0.03),
+    ("Electricity bill", "Utilities", 0.04),
+    ("GST payment", "Tax", 0.02),
+    ("Transport and freight", "Logistics", 0.05),
+)
+
+# Industry benchmark averages loaded alongside the ledgers
+BENCHMARKS = {
+    "Retail": (22.0, 8.0, 9.0, 1.4),
+    "Manufacturing": (30.0, 10.0, 11.0, 1.6),
+    "Services": (45.0, 15.0, 16.0, 1.8),
+    "Hospitality": (35.0, 6.0, 7.0, 1.2),
+    "Wholesale": (15.0, 5.0, 6.0, 1.3),
+}
+
+
+def generate_businesses(businesses: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    ids = np.arange(1, businesses + 1)
+    return pd.DataFrame({
+        "id": ids,
+        "name": [f"SME {i:06d}" for i in ids],
+        "industry": rng.choice(INDUSTRIES, size=businesses),
+    })
+
+
+def generate_transactions(
+    businesses: int,
+    rows_per_business: int,
+    months: int = 24,
+    end: str = "2025-12-31",
+    seed: int = 0
+):
+    """Ledger rows for businesses 1..N: seasonal sales inflows and recurring outflows."""
+    rng = np.random.default_rng(seed)
+    total = businesses * rows_per_business
+
+    business_id = np.repeat(np.arange(1, businesses + 1, dtype="int64"), rows_per_business)
+
+    last_day = pd.Timestamp(end)
+    first_day = (last_day - pd.DateOffset(months=months)) + pd.Timedelta(days=1)
+    span = (last_day - first_day).days + 1
+    day_offset = np.sort(
+        rng.integers(0, span, size=total).reshape(businesses, rows_per_business), axis=1
+    ).ravel() if total else np.empty(0, dtype="int64")
+    dates = first_day + pd.to_timedelta(day_offset, unit="D")
+
+    kinds = SALES + EXPENSES
+    shares = np.array([k[2] for k in kinds])
+    kind = rng.choice(len(kinds), size=total, p=shares / shares.sum())
+    is_sale = kind < len(SALES)
+
+    # Each business has its own scale and a mild margin; sales follow a yearly cycle
+    scale = rng.lognormal(mean=8.0, sigma=0.8, size=businesses)[business_id - 1]
+    margin = rng.normal(1.08, 0.08, size=businesses)[business_id - 1]
+    season = 1 + 0.2 * np.sin(2 * np.pi * dates.month.to_numpy() / 12)
+    size = rng.lognormal(mean=0.0, sigma=0.6, size=total) * scale
+
+    # Expenses are fewer but larger, so outflow lands near inflow / margin
+    sales_share = shares[:len(SALES)].sum() / shares.sum()
+    expense_size = size * sales_share / (1 - sales_share)
+    amount = np.where(is_sale, size * season * margin, -expense_size)
+    amount = np.round(amount, 2)
+
+    templates = np.array([k[0] for k in kinds], dtype=object)[kind]
+    serial = rng.integers(10000, 99999, size=total).astype(str)
+    description = pd.Series(templates) + " " + serial
+
+    return pd.DataFrame({
+        "date": dates,
+        "description": description.to_numpy(),
+        "amount": amount,
+        "category": np.array([k[1] for k in kinds], dtype=object)[kind],
+        "business_id": business_id,
+    })
+
+
+def generate_loans(businesses: int, seed: int = 0):
+    rng = np.random.default_rng(seed + 1)
+    count = rng.integers(0, 4, size=businesses)
+    business_id = np.repeat(np.arange(1, businesses + 1), count)
+    outstanding = np.round(rng.lognormal(mean=12.5, sigma=0.9, size=len(business_id)), 2)
+    return pd.DataFrame({
+        "lender": rng.choice(["HDFC", "SBI", "ICICI", "Axis", "NBFC"], size=len(business_id)),
+        "monthly_emi": np.round(outstanding / rng.integers(12, 61, size=len(business_id)), 2),
+        "outstanding_amount": outstanding,
+        "business_id": business_id,
+    })
+
+
+def generate_gst_returns(transactions: pd.DataFrame, seed: int = 0):
+    """One return per business per month, taxed at 18% of the month's flows."""
+    rng = np.random.default_rng(seed + 2)
+    period = transactions["date"].dt.strftime("%Y-%m")
+    grouped = transactions.assign(
+        period=period,
+        inflow=transactions["amount"].clip(lower=0),
+        outflow=-transactions["amount"].clip(upper=0)
+    ).groupby(["business_id", "period"], sort=True)[["inflow", "outflow"]].sum().reset_index()
+
+    return pd.DataFrame({
+        "period": grouped["period"],
+        "output_gst": np.round(grouped["inflow"] * 0.18 / 1.18, 2),
+        "input_gst": np.round(grouped["outflow"] * 0.18 / 1.18 * 0.6, 2),
+        "filed": (rng.random(len(grouped)) < 0.9).astype(int),
+        "business_id": grouped["business_id"],
+    })
+
+
+def generate_benchmarks():
+    return pd.DataFrame(
+        [(industry, *values) for industry, values in BENCHMARKS.items()],
+        columns=["industry", "avg_gross_margin", "avg_net_margin", "avg_cashflow_margin", "avg_dscr"]
+    )
+
+
+def load_database(db, businesses: int, rows_per_business: int, seed: int = 0, chunk_rows: int = 200_000):
+    """Populate every table (and the monthly rollups) with one synthetic portfolio."""
+    from sqlalchemy import insert
+
+    from app.models.benchmark import IndustryBenchmark
+    from app.models.business import Business
+    from app.models.gst import GSTReturn
+    from app.models.loan import Loan
+    from app.services.ingest import fingerprint_chunk, write_chunk
+    from app.services.monthly_rollup import rebuild_monthly_rollup
+
+    conn = db.connection()
+    transactions = generate_transactions(businesses, rows_per_business, seed=seed)
+    transactions["category_rules"] = None
+    transactions["fingerprint"] = fingerprint_chunk(transactions, Counter())
+    for start in range(0, len(transactions), chunk_rows):
+        write_chunk(conn, transactions.iloc[start:start + chunk_rows])
+
+    conn.execute(insert(Business.__table__), generate_businesses(businesses, seed).to_dict("records"))
+    for model, frame in (
+        (Loan, generate_loans(businesses, seed)),
+        (GSTReturn, generate_gst_returns(transactions, seed)),
+        (IndustryBenchmark, generate_benchmarks()),
+    ):
+        if not frame.empty:
+            conn.execute(insert(model.__table__), frame.to_dict("records"))
+
+    for business_id in range(1, businesses + 1):
+        rebuild_monthly_rollup(db, business_id)
+    db.commit()
+
+    return transactions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic SME portfolio")
+    parser.add_argument("--businesses", type=int, default=10)
+    parser.add_argument("--rows", type=int, default=1000, help="transactions per business")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--csv", help="write one upload-ready CSV for business 1 instead of loading DATABASE_URL")
+    args = parser.parse_args()
+
+    if args.csv:
+        ledger = generate_transactions(1, args.rows, seed=args.seed)
+        ledger[["date", "description", "amount", "category"]].to_csv(args.csv, index=False, date_format="%Y-%m-%d")
+        print(f"Wrote {len(ledger)} rows to {args.csv}")
+        return
+
+    from app.database import SessionLocal
+    import create_tables  # noqa: F401 -- registers every model and creates the schema
+
+    db = SessionLocal()
+    try:
+        ledger = load_database(db, args.businesses, args.rows, seed=args.seed)
+    finally:
+        db.close()
+    print(f"Loaded {len(ledger)} transactions for {args.businesses} businesses")
+
+
+if __name__ == "__main__":
+    main()
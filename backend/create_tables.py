@@ -1,3 +1,5 @@
+from sqlalchemy import inspect, text
+
 from app.database import engine
 from app.models.financial import Transaction
 from app.database import Base
@@ -5,6 +7,27 @@ from app.models.loan import Loan
 from app.models.gst import GSTReturn
 from app.models.benchmark import IndustryBenchmark
 from app.models.user import User
+from app.models.rollup import MonthlyRollup
+from app.models.data_version import DataVersion
+from app.models.translation import Translation
+from app.models.business import Business
 
 Base.metadata.create_all(bind=engine)
+
+# create_all skips tables that already exist, so add any columns they are missing
+inspector = inspect(engine)
+with engine.begin() as conn:
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                conn.execute(text(
+                    f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(engine.dialect)}"
+                ))
+
+# ... and any indexes they are missing
+for table in Base.metadata.sorted_tables:
+    for index in table.indexes:
+        index.create(bind=engine, checkfirst=True)
+
 print("Tables created successfully")
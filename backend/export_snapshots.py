@@ -0,0 +1,29 @@
+import argparse
+import sys
+import time
+
+from app.config import SNAPSHOT_DIR
+from app.database import SessionLocal
+from app.services.snapshots import SNAPSHOT_TABLES, export_snapshots
+
+parser = argparse.ArgumentParser(description="Append new rows to the per-business Arrow snapshots")
+parser.add_argument("--dir", default=SNAPSHOT_DIR, help="snapshot root directory")
+parser.add_argument("--table", choices=list(SNAPSHOT_TABLES), action="append", dest="tables")
+parser.add_argument("--full", action="store_true", help="discard the snapshot and export every row again")
+args = parser.parse_args()
+
+started = time.perf_counter()
+
+db = SessionLocal()
+try:
+    stats = export_snapshots(db, args.dir, tables=args.tables or tuple(SNAPSHOT_TABLES), full=args.full)
+finally:
+    db.close()
+
+for name, table_stats in stats.items():
+    print(
+        f"{name}: {table_stats['rows']} rows for {table_stats['businesses']} businesses "
+        f"(through id {table_stats['through_id']})",
+        file=sys.stderr
+    )
+print(f"Exported to {args.dir} in {time.perf_counter() - started:.3f}s", file=sys.stderr)
@@ -0,0 +1,84 @@
+import argparse
+import json
+import os
+import sys
+import time
+
+import pandas as pd
+from sqlalchemy import select
+
+from app.config import FORECAST_STATE_PATH, SNAPSHOT_DIR
+from app.database import SessionLocal
+from app.models.rollup import MonthlyRollup
+from app.services.forecast_engine import (
+    METHODS, refit, update, forecast_arrays, forecast_response, load_state, save_state
+)
+
+parser = argparse.ArgumentParser(description="Forecast cash flow for every business in one pass")
+parser.add_argument("--months", type=int, default=6)
+parser.add_argument("--model", choices=METHODS, default="sma")
+parser.add_argument("--state", default=FORECAST_STATE_PATH, help="saved smoothing state (.npz)")
+parser.add_argument("--full", action="store_true", help="ignore the saved state and refit all history")
+parser.add_argument("--output", help="NDJSON output file (defaults to stdout)")
+parser.add_argument(
+    "--snapshots", nargs="?", const=SNAPSHOT_DIR, metavar="DIR",
+    help="sum months from the Arrow snapshots written by export_snapshots.py instead of the rollup table"
+)
+args = parser.parse_args()
+
+started = time.perf_counter()
+
+if args.snapshots:
+    from app.services.snapshots import load_monthly_portfolio
+
+    monthly = load_monthly_portfolio(root=args.snapshots)[["business_id", "month", "net"]]
+else:
+    db = SessionLocal()
+    try:
+        monthly = pd.read_sql(
+            select(MonthlyRollup.business_id, MonthlyRollup.month, MonthlyRollup.net),
+            db.connection()
+        )
+    finally:
+        db.close()
+
+if monthly.empty:
+    print("No rollup data to forecast", file=sys.stderr)
+    sys.exit(0)
+
+# Only closed months go into the saved state; the open month is applied to a copy
+current_month = pd.Period.now(freq="M")
+closed_through = current_month - 1
+
+state = None
+if not args.full and os.path.exists(args.state):
+    state = load_state(args.state)
+
+state = refit(monthly, closed_through, state)
+save_state(state, args.state)
+
+open_rows = monthly[pd.PeriodIndex(monthly["month"], freq="M") >= current_month]
+live = state
+if not open_rows.empty:
+    live = refit(monthly, current_month, state)
+
+arrays = forecast_arrays(live, months_ahead=args.months, method=args.model)
+
+out = open(args.output, "w") if args.output else sys.stdout
+for i, business_id in enumerate(arrays["business_ids"]):
+    runway = arrays["runway_months"][i]
+    row = {
+        "business_id": int(business_id),
+        **forecast_response(arrays, i, live["last_month"], args.months, method=args.model),
+        "runway_months": None if pd.isna(runway) else round(float(runway), 1)
+    }
+    out.write(json.dumps(row) + "\n")
+if args.output:
+    out.close()
+
+elapsed = time.perf_counter() - started
+print(
+    f"Forecast {len(arrays['business_ids'])} businesses through {live['last_month']} "
+    f"in {elapsed:.3f}s",
+    file=sys.stderr
+)
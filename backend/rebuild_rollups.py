@@ -0,0 +1,14 @@
+from sqlalchemy import select
+from app.database import SessionLocal
+from app.models.financial import Transaction
+from app.services.monthly_rollup import rebuild_monthly_rollup
+
+db = SessionLocal()
+business_ids = db.execute(select(Transaction.business_id).distinct()).scalars().all()
+
+for business_id in business_ids:
+    rebuild_monthly_rollup(db, business_id)
+
+db.commit()
+db.close()
+print(f"Rebuilt monthly rollups for {len(business_ids)} businesses")
@@ -0,0 +1,45 @@
+import argparse
+import sys
+from functools import partial
+
+from app.config import SNAPSHOT_DIR
+from app.database import SessionLocal
+from app.services.portfolio import score_portfolio, iter_ndjson
+
+parser = argparse.ArgumentParser(description="Score every business in the portfolio")
+parser.add_argument("--format", choices=["ndjson", "parquet"], default="ndjson")
+parser.add_argument("--output", help="output file (defaults to stdout for ndjson)")
+parser.add_argument("--business-id", type=int, action="append", dest="business_ids")
+parser.add_argument(
+    "--snapshots", nargs="?", const=SNAPSHOT_DIR, metavar="DIR",
+    help="score from the Arrow snapshots written by export_snapshots.py instead of the database"
+)
+args = parser.parse_args()
+
+if args.snapshots:
+    from app.services import snapshots
+
+    scores, stats = score_portfolio(None, args.business_ids, load=partial(snapshots.load_portfolio, root=args.snapshots))
+else:
+    db = SessionLocal()
+    try:
+        scores, stats = score_portfolio(db, args.business_ids)
+    finally:
+        db.close()
+
+if args.format == "parquet":
+    if not args.output:
+        parser.error("--output is required for parquet")
+    scores.to_parquet(args.output, index=False)  # requires pyarrow
+else:
+    out = open(args.output, "w") if args.output else sys.stdout
+    for chunk in iter_ndjson(scores):
+        out.write(chunk)
+    if args.output:
+        out.close()
+
+print(
+    f"Scored {stats['businesses']} businesses in {stats['elapsed_seconds']}s "
+    f"({stats['businesses_per_second']} businesses/s)",
+    file=sys.stderr
+)
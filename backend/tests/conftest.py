@@ -0,0 +1,22 @@
+import os
+import tempfile
+
+# Before anything imports app.config: the suite runs against a throwaway SQLite file
+_workdir = tempfile.mkdtemp(prefix="sme-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_workdir, 'test.db')}"
+os.environ.setdefault("OPENAI_API_KEY", "")
+
+import pytest
+
+
+@pytest.fixture(scope="session")
+def seeded_db():
+    """Schema plus a small synthetic portfolio (businesses 1 and 2), shared by the whole session."""
+    import create_tables  # noqa: F401 -- registers every model and creates the schema
+    from app.database import SessionLocal
+    from benchmarks.synthetic import load_database
+
+    db = SessionLocal()
+    load_database(db, 2, 400, seed=7)
+    db.close()
+    return os.environ["DATABASE_URL"]
@@ -0,0 +1,38 @@
+import threading
+import time
+
+from app.database import SessionLocal
+from app.services import benchmark_registry
+
+
+def test_callers_queued_on_a_rebuild_reuse_its_snapshot(seeded_db, monkeypatch):
+    loads = []
+    load_benchmarks = benchmark_registry._load_benchmarks
+
+    def slow_load(db):
+        loads.append(threading.get_ident())
+        time.sleep(0.1)
+        return load_benchmarks(db)
+
+    monkeypatch.setattr(benchmark_registry, "_load_benchmarks", slow_load)
+    monkeypatch.setattr(benchmark_registry, "_snapshot", None)
+
+    snapshots = []
+    start = threading.Barrier(6)
+
+    def caller():
+        db = SessionLocal()
+        try:
+            start.wait()
+            snapshots.append(benchmark_registry.get_registry(db))
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=caller) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+
+    assert len(loads) == 1
+    assert len(snapshots) == 6 and all(s is snapshots[0] for s in snapshots)
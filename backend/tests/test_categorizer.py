@@ -0,0 +1,39 @@
+import json
+import os
+
+import pandas as pd
+
+from app.services import categorizer
+from app.services.categorizer import CategoryMatcher, categorize_chunk
+
+
+def test_rows_record_the_version_of_the_dictionary_that_categorized_them(monkeypatch):
+    old = CategoryMatcher({"categories": {"Rent": ["rent"]}}, version="old")
+    new = CategoryMatcher({"categories": {"Utilities": ["rent"]}}, version="new")
+
+    # A hot reload lands between the first and any later look at the dictionary
+    reloads = iter([old, new, new])
+    monkeypatch.setattr(categorizer, "get_category_matcher", lambda: next(reloads))
+
+    chunk = pd.DataFrame({"description": ["Office rent March", "Client payment"], "category": [None, "Sales"]})
+    category, source = categorize_chunk(chunk)
+
+    assert category.tolist() == ["Rent", "Sales"]
+    assert source.iloc[0] == "old" and pd.isna(source.iloc[1])
+
+
+def test_edited_dictionary_gets_a_new_version(tmp_path, monkeypatch):
+    path = tmp_path / "category_rules.json"
+    monkeypatch.setattr(categorizer, "CATEGORY_RULES_PATH", str(path))
+    monkeypatch.setattr(categorizer, "_state", {"mtime": None, "matcher": None})
+
+    path.write_text(json.dumps({"categories": {"Rent": ["rent"]}}))
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+    first = categorizer.get_category_matcher()
+
+    path.write_text(json.dumps({"categories": {"Rent": ["rent", "lease"]}}))
+    os.utime(path, ns=(2_000_000_000, 2_000_000_000))
+    second = categorizer.get_category_matcher()
+
+    assert first.version != second.version
+    assert categorizer.category_rules_version() == second.version
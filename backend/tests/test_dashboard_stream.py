@@ -0,0 +1,144 @@
+import asyncio
+import io
+
+import httpx
+import pytest
+
+from app.main import app
+from app.services import dashboard_stream
+from app.services.upload_jobs import upload_queue
+
+CSV = b"date,description,amount\n2025-12-30,Stream test sale,1500.00\n2025-12-31,Stream test rent,-400.00\n"
+
+
+class StreamClient:
+    """An in-process SSE client: drives the ASGI app directly and hands back events as they are sent.
+
+    TestClient (and httpx's ASGITransport) collect the whole body before
+    returning, which never happens for an open stream.
+    """
+
+    def __init__(self, business_id: int):
+        self.business_id = business_id
+        self.chunks = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        self.task = None
+
+    async def __aenter__(self):
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": "/analysis/stream",
+            "raw_path": b"/analysis/stream",
+            "root_path": "",
+            "query_string": f"business_id={self.business_id}".encode(),
+            "headers": [(b"host", b"testserver")],
+            "client": ("testclient", 50000),
+            "server": ("testserver", 80),
+        }
+
+        async def receive():
+            await self.disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body" and message.get("body"):
+                await self.chunks.put(message["body"].decode())
+
+        self.task = asyncio.ensure_future(app(scope, receive, send))
+        return self
+
+    async def __aexit__(self, *exc):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, 5)
+
+    async def event(self, timeout: float = 10):
+        """The next event as a dict of its fields; keepalive comments are skipped."""
+        while True:
+            chunk = await asyncio.wait_for(self.chunks.get(), timeout)
+            if chunk.startswith(":"):
+                continue
+            return dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+
+    async def no_event(self, wait: float = 0.5):
+        try:
+            chunk = await asyncio.wait_for(self.chunks.get(), wait)
+        except asyncio.TimeoutError:
+            return True
+        return chunk.startswith(":")
+
+
+@pytest.fixture
+def snapshot_calls(monkeypatch):
+    calls = []
+    snapshot = dashboard_stream._snapshot
+
+    def counting_snapshot(business_id):
+        calls.append(business_id)
+        return snapshot(business_id)
+
+    monkeypatch.setattr(dashboard_stream, "_snapshot", counting_snapshot)
+    return calls
+
+
+async def upload(csv: bytes, business_id: int):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        response = await client.post(
+            f"/upload/?business_id={business_id}", files={"file": ("statement.csv", io.BytesIO(csv), "text/csv")}
+        )
+    assert response.status_code == 202
+    job = upload_queue.get(response.json()["job_id"])
+    await asyncio.wrap_future(job.future)
+    assert job.status == "completed", job.error
+    return job.result
+
+
+def test_snapshot_on_connect_and_one_recompute_per_upload(seeded_db, snapshot_calls):
+    async def scenario():
+        async with StreamClient(1) as first, StreamClient(1) as second:
+            connected = await first.event()
+            assert connected["event"] == "dashboard"
+            assert '"health"' in connected["data"]
+            assert (await second.event())["id"] == connected["id"]
+            assert snapshot_calls == [1]
+
+            result = await upload(CSV, business_id=1)
+            assert result["rows_inserted"] == 2
+
+            updates = [await first.event(), await second.event()]
+            assert {u["event"] for u in updates} == {"dashboard"}
+            assert updates[0]["id"] == updates[1]["id"] != connected["id"]
+            assert snapshot_calls == [1, 1]
+
+            # The same statement again inserts nothing, so nothing is recomputed or sent
+            result = await upload(CSV, business_id=1)
+            assert result["rows_inserted"] == 0
+            assert await first.no_event() and await second.no_event()
+            assert snapshot_calls == [1, 1]
+
+    asyncio.run(scenario())
+
+
+def test_failed_snapshot_sends_error_event(seeded_db, monkeypatch):
+    def broken_snapshot(business_id):
+        raise RuntimeError("database went away")
+
+    monkeypatch.setattr(dashboard_stream, "_snapshot", broken_snapshot)
+
+    async def scenario():
+        async with StreamClient(2) as client:
+            failed = await client.event()
+            assert failed["event"] == "error"
+            assert "id" not in failed
+            assert await client.no_event()
+
+            # The failure isn't cached: the next change is computed afresh and delivered
+            monkeypatch.undo()
+            await upload(CSV, business_id=2)
+            assert (await client.event())["event"] == "dashboard"
+
+    asyncio.run(scenario())
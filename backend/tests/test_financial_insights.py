@@ -0,0 +1,112 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai import financial_insights
+from app.ai.resilience import CLOSED, RequestBudget, current_budget, openai_breaker
+from app.ai.financial_insights import fallback_insights, generate_financial_insights_async, insights_cache
+
+METRICS = {"revenue": 1000.0, "expenses": 800.0, "profit_margin": 20.0, "cash_balance": 200.0, "runway_months": 6.0}
+
+
+class FakeAsyncClient:
+    """Just enough of AsyncOpenAI: chat.completions.create, with a delay and optional failure."""
+
+    def __init__(self, delay: float = 0.05, fail: bool = False):
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.active = 0
+        self.peak = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, model, messages, timeout):
+        self.calls += 1
+        number = self.calls
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError("API down")
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=f"advice #{number}"))])
+        finally:
+            self.active -= 1
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    insights_cache.backend.clear()
+    # A fresh semaphore per test: asyncio primitives bind to the first loop that waits on them
+    monkeypatch.setattr(financial_insights, "_async_slots", asyncio.Semaphore(2))
+    # Failures in one test must not leave the shared breaker open for the next
+    monkeypatch.setattr(openai_breaker, "state", CLOSED)
+    monkeypatch.setattr(openai_breaker, "consecutive_failures", 0)
+    yield
+    insights_cache.backend.clear()
+
+
+async def in_request(coro_fn):
+    """Run `coro_fn()` with its own request budget, as LLMBudgetMiddleware does; returns (result, budget)."""
+    budget = RequestBudget(8)
+    token = current_budget.set(budget)
+    try:
+        return await coro_fn(), budget
+    finally:
+        current_budget.reset(token)
+
+
+def test_request_joining_a_failed_completion_is_marked_degraded():
+    client = FakeAsyncClient(fail=True)
+
+    async def scenario():
+        ask = lambda: generate_financial_insights_async(70, METRICS, llm_client=client)
+        return await asyncio.gather(in_request(ask), in_request(ask))
+
+    (first, first_budget), (second, second_budget) = asyncio.run(scenario())
+    assert client.calls == 1
+    assert first == second == fallback_insights(70)
+    assert first_budget.degraded and second_budget.degraded
+
+
+def test_concurrent_completions_are_capped_by_the_semaphore():
+    client = FakeAsyncClient(delay=0.05)
+
+    async def scenario():
+        # Distinct scores, so nothing is deduplicated and every request needs its own completion
+        return await asyncio.gather(*[
+            generate_financial_insights_async(score, METRICS, llm_client=client) for score in range(10, 70, 10)
+        ])
+
+    texts = asyncio.run(scenario())
+    assert client.calls == 6
+    assert client.peak == 2
+    assert len(set(texts)) == 6
+
+
+def test_identical_concurrent_requests_share_one_completion():
+    client = FakeAsyncClient(delay=0.05)
+
+    async def scenario():
+        return await asyncio.gather(*[
+            generate_financial_insights_async(70, METRICS, llm_client=client) for _ in range(5)
+        ])
+
+    texts = asyncio.run(scenario())
+    assert client.calls == 1
+    assert texts == ["advice #1"] * 5
+    assert financial_insights._inflight == {}
+
+    # ...and the result is cached for later requests
+    assert asyncio.run(generate_financial_insights_async(70, METRICS, llm_client=client)) == "advice #1"
+    assert client.calls == 1
+
+
+def test_fallback_is_not_cached():
+    down = FakeAsyncClient(fail=True)
+    assert asyncio.run(generate_financial_insights_async(70, METRICS, llm_client=down)) == fallback_insights(70)
+
+    up = FakeAsyncClient()
+    assert asyncio.run(generate_financial_insights_async(70, METRICS, llm_client=up)) == "advice #1"
+    assert up.calls == 1
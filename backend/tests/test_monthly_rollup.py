@@ -0,0 +1,60 @@
+import threading
+import time
+
+import pandas as pd
+
+from app.database import SessionLocal
+from app.models.rollup import MonthlyRollup
+from app.services.monthly_rollup import apply_monthly_rollup, load_monthly_rollup
+
+BUSINESS_ID = 900
+
+
+def chunk_sums(month: str, inflow: float, outflow: float, rows: int):
+    return pd.DataFrame(
+        {"inflow": [inflow], "outflow": [outflow], "net": [inflow - outflow], "row_count": [rows]},
+        index=pd.PeriodIndex([month], freq="M", name="month")
+    )
+
+
+def test_concurrent_uploads_starting_the_same_month_add_up(seeded_db):
+    first_applied = threading.Event()
+    release_first = threading.Event()
+    errors = []
+
+    def upload(sums, hold=False):
+        db = SessionLocal()
+        try:
+            apply_monthly_rollup(db, BUSINESS_ID, sums)
+            if hold:
+                first_applied.set()
+                release_first.wait(5)
+            db.commit()
+        except Exception as e:
+            errors.append(e)
+            db.rollback()
+        finally:
+            db.close()
+
+    # The second upload writes while the first, which created the month, is still uncommitted
+    first = threading.Thread(target=upload, args=(chunk_sums("2030-01", 100, 40, 3), True))
+    second = threading.Thread(target=upload, args=(chunk_sums("2030-01", 50, 10, 2),))
+    first.start()
+    first_applied.wait(5)
+    second.start()
+    time.sleep(0.2)
+    release_first.set()
+    first.join()
+    second.join()
+
+    assert errors == []
+    db = SessionLocal()
+    try:
+        rollup = load_monthly_rollup(db, BUSINESS_ID)
+        db.query(MonthlyRollup).filter(MonthlyRollup.business_id == BUSINESS_ID).delete()
+        db.commit()
+    finally:
+        db.close()
+
+    row = rollup.loc[pd.Period("2030-01", freq="M")]
+    assert (row["inflow"], row["outflow"], row["net"], row["row_count"]) == (150, 50, 100, 5)
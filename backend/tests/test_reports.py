@@ -0,0 +1,71 @@
+from fastapi.testclient import TestClient
+
+from app.ai.resilience import mark_degraded
+from app.database import SessionLocal
+from app.main import app
+from app.services import assessment, report_generator, report_jobs
+from app.services.report_generator import generate_pdf_report, generate_pdf_reports
+
+
+def test_translated_gst_warnings_reach_the_report(seeded_db, monkeypatch):
+    monkeypatch.setattr(assessment, "translate_batch", lambda texts, lang: [f"[{lang}] {t}" for t in texts])
+    report_jobs.report_cache.backend.clear()
+    assessment.result_cache.backend.clear()
+
+    db = SessionLocal()
+    try:
+        english = report_jobs.report_summary(db, 1, "en")
+        hindi = report_jobs.report_summary(db, 1, "hi")
+    finally:
+        db.close()
+
+    assert english["GST Warnings"]
+    assert hindi["GST Warnings"] == [f"[hi] {w}" for w in english["GST Warnings"]]
+    assert generate_pdf_report(hindi).startswith(b"%PDF")
+
+
+def test_bulk_rendering_reuses_one_process_pool():
+    summaries = [{"Financial Health Score": score, "GST Warnings": ["Unfiled periods"]} for score in (40, 80)]
+
+    first = generate_pdf_reports(summaries)
+    pool = report_generator._pool
+    second = generate_pdf_reports(summaries[:1])
+
+    assert pool is not None and report_generator._pool is pool
+    assert len(first) == 2 and len(second) == 1
+    assert all(pdf.startswith(b"%PDF") for pdf in first + second)
+
+
+def test_bulk_job_caches_only_the_reports_that_did_not_degrade(seeded_db, monkeypatch):
+    summary = report_jobs.report_summary
+
+    def flaky_summary(db, business_id, lang="en"):
+        if business_id == 1:
+            mark_degraded()
+        return summary(db, business_id, lang)
+
+    monkeypatch.setattr(report_jobs, "report_summary", flaky_summary)
+    report_jobs.report_cache.backend.clear()
+
+    job = report_jobs.submit_bulk_reports([1, 2], "en")
+    job.future.result(timeout=60)
+    assert job.status == "completed", job.error
+
+    db = SessionLocal()
+    try:
+        degraded, clean = (report_jobs.report_key(db, business_id, "en") for business_id in (1, 2))
+    finally:
+        db.close()
+    assert report_jobs.report_cache.lookup(degraded) is None
+    assert report_jobs.report_cache.lookup(clean) is not None
+
+
+def test_report_download_revalidates_with_a_weak_etag(seeded_db):
+    client = TestClient(app)
+    first = client.get("/reports/download", params={"business_id": 2})
+    assert first.status_code == 200
+    assert first.headers["ETag"].startswith('W/"')
+
+    again = client.get("/reports/download", params={"business_id": 2}, headers={"If-None-Match": first.headers["ETag"]})
+    assert again.status_code == 304
+    assert again.headers["ETag"] == first.headers["ETag"]
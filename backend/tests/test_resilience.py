@@ -0,0 +1,214 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai.resilience import (
+    CLOSED, HALF_OPEN, OPEN,
+    CircuitBreaker, LLMUnavailable, RequestBudget,
+    call_timeout, current_budget, guarded_call, guarded_call_async, llm_degraded, openai_breaker,
+)
+from app.services.jobs import JobQueue
+from app.services.translator import phrase_cache, translate_batch
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class SlowClient:
+    """Stands in for the OpenAI client: takes `latency` seconds, or times out if given less."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.calls = 0
+
+    def complete(self, timeout):
+        self.calls += 1
+        if self.latency > timeout:
+            time.sleep(timeout)
+            raise TimeoutError("completion timed out")
+        time.sleep(self.latency)
+        return "completion"
+
+    async def complete_async(self, timeout):
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return "completion"
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def budget():
+    """A fresh request budget for the test, as LLMBudgetMiddleware would install."""
+    def install(seconds: float = 8):
+        token = current_budget.set(RequestBudget(seconds))
+        tokens.append(token)
+        return current_budget.get()
+
+    tokens = []
+    yield install
+    for token in reversed(tokens):
+        current_budget.reset(token)
+
+
+def failing(timeout):
+    raise ConnectionError("API down")
+
+
+def test_breaker_trips_after_consecutive_failures_and_fails_fast(clock):
+    breaker = CircuitBreaker("test", failures=3, reset_seconds=30, clock=clock)
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            guarded_call(failing, breaker)
+    assert breaker.state == OPEN
+
+    slow = SlowClient(latency=5)
+    started = time.perf_counter()
+    with pytest.raises(LLMUnavailable):
+        guarded_call(slow.complete, breaker)
+    assert slow.calls == 0
+    assert time.perf_counter() - started < 0.05
+
+
+def test_success_resets_the_failure_count(clock):
+    breaker = CircuitBreaker("test", failures=2, reset_seconds=30, clock=clock)
+    with pytest.raises(ConnectionError):
+        guarded_call(failing, breaker)
+    assert guarded_call(SlowClient(0).complete, breaker) == "completion"
+    with pytest.raises(ConnectionError):
+        guarded_call(failing, breaker)
+    assert breaker.state == CLOSED
+
+
+def test_half_open_lets_one_probe_through_and_recovers(clock):
+    breaker = CircuitBreaker("test", failures=1, reset_seconds=30, clock=clock)
+    with pytest.raises(ConnectionError):
+        guarded_call(failing, breaker)
+
+    clock.now += 29
+    assert not breaker.allow()
+
+    clock.now += 1
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()  # only one probe at a time
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert guarded_call(SlowClient(0).complete, breaker) == "completion"
+
+
+def test_failed_probe_reopens_for_another_period(clock):
+    breaker = CircuitBreaker("test", failures=1, reset_seconds=30, clock=clock)
+    with pytest.raises(ConnectionError):
+        guarded_call(failing, breaker)
+
+    clock.now += 30
+    with pytest.raises(ConnectionError):
+        guarded_call(failing, breaker)
+    assert breaker.state == OPEN
+
+    clock.now += 29
+    with pytest.raises(LLMUnavailable):
+        guarded_call(failing, breaker)
+
+
+def test_cancelled_probe_does_not_wedge_the_breaker(clock):
+    breaker = CircuitBreaker("test", failures=1, reset_seconds=30, clock=clock)
+    with pytest.raises(ConnectionError):
+        guarded_call(failing, breaker)
+    clock.now += 30
+
+    async def cancelled_probe():
+        probe = asyncio.ensure_future(guarded_call_async(SlowClient(latency=5).complete_async, breaker))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(cancelled_probe())
+    assert breaker.state == OPEN
+    assert not breaker._probing
+
+    clock.now += 30
+    assert guarded_call(SlowClient(0).complete, breaker) == "completion"
+    assert breaker.state == CLOSED
+
+
+def test_budget_cuts_a_slow_call_and_then_refuses_more(budget, clock):
+    breaker = CircuitBreaker("test", failures=5, reset_seconds=30, clock=clock)
+    request = budget(0.2)
+    slow = SlowClient(latency=5)
+
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        asyncio.run(guarded_call_async(slow.complete_async, breaker))
+    assert time.perf_counter() - started < 1
+    assert request.degraded and llm_degraded()
+
+    with pytest.raises(LLMUnavailable):
+        guarded_call(slow.complete, breaker)
+    assert slow.calls == 1
+
+
+def test_sync_call_is_given_what_is_left_of_the_budget(budget, clock):
+    breaker = CircuitBreaker("test", failures=5, reset_seconds=30, clock=clock)
+    budget(0.2)
+    slow = SlowClient(latency=5)
+
+    started = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        guarded_call(slow.complete, breaker)
+    assert time.perf_counter() - started < 1
+    assert llm_degraded()
+
+
+def test_job_gets_its_own_budget(budget):
+    budget(0.01)
+    time.sleep(0.02)
+    assert call_timeout() < 0
+
+    queue = JobQueue(workers=1, name="test-jobs")
+    job = queue.submit("test", lambda job: (call_timeout(), llm_degraded()))
+    job.future.result(timeout=5)
+
+    timeout, degraded = job.result
+    assert timeout > 0 and not degraded
+
+
+class GarbledClient:
+    """A sync chat client whose completions come back as `reply`, whatever was asked."""
+
+    def __init__(self, reply: str):
+        self.reply = reply
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages, timeout):
+        self.calls += 1
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.reply))])
+
+
+@pytest.mark.parametrize("reply", ["Sorry, I can't help with that.", '["only one"]'])
+def test_unusable_translation_counts_as_a_failure_and_is_not_cached(seeded_db, budget, monkeypatch, reply):
+    monkeypatch.setattr(openai_breaker, "state", CLOSED)
+    monkeypatch.setattr(openai_breaker, "consecutive_failures", 0)
+    request = budget()
+    texts = [f"Unfiled return ({reply[:8]})", f"Late filing ({reply[:8]})"]
+    client = GarbledClient(reply)
+
+    assert translate_batch(texts, "hi", llm_client=client) == texts
+    assert client.calls == 1
+    assert request.degraded
+    assert openai_breaker.consecutive_failures == 1
+    assert all(phrase_cache.lookup((text, "hi")) is None for text in texts)
@@ -0,0 +1,18 @@
+from fastapi.testclient import TestClient
+
+from app.config import MAX_SCENARIO_CELLS
+from app.main import app
+
+
+def test_oversized_simulation_is_rejected(seeded_db):
+    with TestClient(app) as client:
+        response = client.get("/analysis/scenarios?business_id=1&paths=100000&months=120&seed=1")
+    assert response.status_code == 422
+    assert str(MAX_SCENARIO_CELLS) in response.json()["detail"]
+
+
+def test_simulation_within_the_cap_runs(seeded_db):
+    with TestClient(app) as client:
+        response = client.get("/analysis/scenarios?business_id=1&paths=1000&months=24&seed=1")
+    assert response.status_code == 200
+    assert response.json()["paths"] == 1000